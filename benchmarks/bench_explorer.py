@@ -0,0 +1,87 @@
+"""Explorer hot paths: load, filter and aggregation.
+
+The engine is the uncached CubeEngine, so every round measures the
+computation (the page wraps it in survey.cache.CachedEngine).
+"""
+import pytest
+
+from survey import cohort, config, itemsets, model as survey_model, tables
+from survey.bitmap import BitmapIndex, index_columns
+
+FILTER_STATES = ["all", "one_filter", "two_filters"]
+
+
+# ============================================================
+# LOAD
+# ============================================================
+def bench_load_model(benchmark, dataset, model_dir, monkeypatch):
+    monkeypatch.setattr(config, "MODEL_DIR", model_dir)
+    model = benchmark(survey_model.load_model)
+    assert len(model.respondents) == len(dataset.model.respondents)
+
+
+def bench_build_bitmap_index(benchmark, dataset):
+    benchmark(BitmapIndex.from_model, dataset.model, index_columns(dataset.model))
+
+
+# ============================================================
+# FILTER
+# ============================================================
+@pytest.mark.parametrize("state", FILTER_STATES)
+def bench_filter(benchmark, dataset, state):
+    """Sidebar selection → respondent count (bitmap AND/OR + popcount)."""
+    benchmark(dataset.engine.size, dataset.selections[state])
+
+
+def bench_filter_rows(benchmark, dataset):
+    """Sidebar selection → respondent frame (what live aggregation starts from)."""
+    benchmark(dataset.engine.respondents, dataset.selections["two_filters"])
+
+
+# ============================================================
+# AGGREGATION
+# ============================================================
+@pytest.mark.parametrize("state", FILTER_STATES)
+@pytest.mark.parametrize("dim", ["industry", "team_focus"])
+def bench_count_distinct(benchmark, dataset, state, dim):
+    benchmark(tables.distribution, dataset.engine, dataset.selections[state], dim)
+
+
+@pytest.mark.parametrize("state", FILTER_STATES)
+def bench_comparison_chart(benchmark, dataset, state):
+    benchmark(tables.comparison, dataset.engine, dataset.selections[state],
+              "bottleneck_clean", "role_clean")
+
+
+@pytest.mark.parametrize("state", FILTER_STATES)
+@pytest.mark.parametrize("dims", [("role_clean", "org_size"), ("team_focus", "ai_helps_with")])
+def bench_crosstab(benchmark, dataset, state, dims):
+    benchmark(tables.crosstab, dataset.engine, dataset.selections[state], *dims, "Column %")
+
+
+def bench_cohort_split(benchmark, dataset):
+    """Cohort tab: split on a pain-point pair, then one distribution per cohort."""
+    engine = dataset.engine
+    pair = cohort.parse('modeling_pain_points = "Hard to maintain over time" '
+                        'and modeling_pain_points = "Pressure to “move fast”"')
+
+    def cohorts():
+        has, rest = engine.split(dataset.selections["all"], pair)
+        return (tables.distribution(engine, has, "bottleneck_clean"),
+                tables.distribution(engine, rest, "bottleneck_clean"))
+
+    benchmark(cohorts)
+
+
+@pytest.mark.parametrize("k", [2, 3])
+def bench_cohort_combinations(benchmark, dataset, k):
+    """Many-cohort comparison (API /cohorts?field=): every k-combination of team focuses."""
+    cohorts = cohort.combinations("team_focus", config.MULTI_SELECT_OPTIONS["team_focus"], k)
+    benchmark(tables.cohort_comparison, dataset.engine, dataset.selections["all"],
+              cohorts, "bottleneck_clean")
+
+
+@pytest.mark.parametrize("max_size", [2, 3])
+def bench_itemsets(benchmark, dataset, max_size):
+    """Cohort tab, frequent combinations: Apriori over every multi-select field."""
+    benchmark(itemsets.mine, dataset.engine, dataset.selections["all"], None, 0.02, max_size)
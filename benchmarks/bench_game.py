@@ -0,0 +1,12 @@
+"""Game question banks, built from the full respondent table."""
+from survey import questions
+
+
+def bench_build_hl_questions(benchmark, dataset):
+    bank = benchmark(questions.build_hl_questions, dataset.model)
+    assert bank
+
+
+def bench_build_guess_questions(benchmark, dataset):
+    bank = benchmark(questions.build_guess_questions, dataset.model)
+    assert bank
@@ -0,0 +1,86 @@
+"""Fixtures for the benchmark suite: the real survey and scaled copies.
+
+Scaled datasets resample whole respondents (with their multi-select
+bridge rows) from the real survey, so value distributions and the number of
+options per respondent match the real data at 10× and 100× the size.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "gamification"))
+
+from survey import config, model as survey_model, pipeline, store  # noqa: E402
+from survey.bitmap import BitmapIndex, index_columns  # noqa: E402
+from survey.cube import CubeEngine, build_cube  # noqa: E402
+
+SCALES = {"real": 1, "10x": 10, "100x": 100}
+
+
+def scale_model(model, factor, seed=0):
+    """SurveyModel with len(respondents) * factor respondents drawn with replacement."""
+    if factor == 1:
+        return model
+    rng = np.random.default_rng(seed)
+    respondents = model.respondents
+    rows = rng.integers(0, len(respondents), len(respondents) * factor)
+    scaled = respondents.iloc[rows].reset_index(drop=True)
+    scaled["id"] = np.arange(1, len(scaled) + 1)
+    new_ids = pd.DataFrame({"source": respondents["id"].to_numpy()[rows], "id": scaled["id"]})
+    bridges = {}
+    for field, bridge in model.bridges.items():
+        bridges[field] = (
+            new_ids.merge(bridge.rename(columns={"id": "source"}), on="source")
+            .drop(columns="source")
+            .sort_values("id", kind="stable")
+            .reset_index(drop=True)
+        )
+    return survey_model.SurveyModel(scaled, bridges)
+
+
+class Dataset:
+    """A model plus the Explorer engine (uncached) and sample filter states."""
+
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+        self.index = BitmapIndex.from_model(model, index_columns(model))
+        self.engine = CubeEngine(model, self.index, build_cube(model))
+        everything = {col: self.index.values(col) for col in config.FILTER_COLUMNS}
+        self.selections = {
+            # Default view: served from the cube
+            "all": everything,
+            # One restricted filter: summed cube slices
+            "one_filter": dict(everything, org_size=["10,000+", "1,000–10,000"]),
+            # Two restricted filters: bitmap filter + live aggregation
+            "two_filters": dict(everything, role_clean=["Data Engineer", "Analytics Engineer"],
+                                region=everything["region"][:2]),
+        }
+
+
+@pytest.fixture(scope="session")
+def real_model():
+    pipeline.build()
+    return survey_model.load_model()
+
+
+@pytest.fixture(scope="session", params=list(SCALES))
+def dataset(request, real_model):
+    return Dataset(request.param, scale_model(real_model, SCALES[request.param]))
+
+
+@pytest.fixture(scope="session")
+def model_dir(dataset, tmp_path_factory):
+    """The dataset's star schema written as Parquet; loads read from here."""
+    path = tmp_path_factory.mktemp(f"model-{dataset.name}")
+    saved = config.MODEL_DIR
+    config.MODEL_DIR = path
+    try:
+        store.write_model(dataset.model.respondents, dataset.model.bridges)
+    finally:
+        config.MODEL_DIR = saved
+    return path
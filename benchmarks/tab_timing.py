@@ -0,0 +1,68 @@
+"""Per-tab Explorer compute time, eager vs lazy tabs.
+
+Runs pages/Explorer.py headlessly (streamlit.testing AppTest) once per tab
+with that tab selected and reports the median script-run time over a few
+repetitions:
+
+    eager   every tab renders on each run (SURVEY_LAZY_TABS=0, the old page)
+    lazy    only the selected tab renders
+
+The aggregate cache is disabled so the numbers measure compute, not cache
+hits. Run from the repository root:
+
+    python benchmarks/tab_timing.py [--repeat 5]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "gamification"))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from survey import config  # noqa: E402
+
+PAGE = ROOT / "gamification" / "pages" / "Explorer.py"
+TAB_LABELS = [
+    "📋 Overview", "🏗️ Infrastructure", "🤖 AI Adoption",
+    "📐 Modeling", "🔥 Challenges", "🧬 Cohort Analysis", "📊 Crosstab"
+]
+
+
+def time_tab(label, lazy, repeat):
+    """Median seconds of a page run with `label` selected."""
+    config.LAZY_TABS = lazy
+    at = AppTest.from_file(str(PAGE), default_timeout=300)
+    at.session_state["explorer_tab"] = label
+    at.run()  # warm-up: engine load, imports
+    times = []
+    for _ in range(repeat):
+        at.session_state["explorer_tab"] = label
+        start = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Measure compute: every aggregate misses the (disabled) cache
+    config.AGGREGATE_CACHE_SIZE = 0
+
+    print(f"{'tab':<22}{'eager ms':>10}{'lazy ms':>10}{'speedup':>9}")
+    for label in TAB_LABELS:
+        eager = time_tab(label, False, args.repeat)
+        lazy = time_tab(label, True, args.repeat)
+        print(f"{label:<22}{eager * 1000:>10.1f}{lazy * 1000:>10.1f}{eager / lazy:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import random
 
+from survey import cohort, config, data as survey_data, itemsets, tables
+
 if st.button("🎮 Back to the game"):
     st.switch_page("pages/Game.py")
 
@@ -27,53 +28,34 @@ BG_CHART = "rgba(0,0,0,0)"
 # ============================================================
 # LOAD DATA
 # ============================================================
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/expanded.csv")
-    # Drop the unnamed index column
-    if "Unnamed: 0" in df.columns:
-        df = df.drop(columns=["Unnamed: 0"])
-
-    # Clean architecture_trend into a usable dimension
-    arch_map = {
-        "Centralized warehouse": "Centralized warehouse",
-        "Lakehouse": "Lakehouse",
-        "Data mesh / federated ownership": "Data mesh / federated",
-        "Event-driven architecture": "Event-driven",
-    }
-    df["architecture_clean"] = df["architecture_trend"].map(arch_map).fillna("Other")
-
-    # Clean education_topic — bucket freetext into "Other"
-    main_topics = [
-        "AI/LLM integration", "Data modeling",
-        "Semantics / ontologies / knowledge graphs",
-        "Architecture patterns", "Streaming / event-driven systems",
-        "Career growth / leadership", "Reliability engineering",
-    ]
-    df["education_clean"] = df["education_topic"].where(
-        df["education_topic"].isin(main_topics), "Other"
-    )
-
-    return df
-
-
-df = load_data()
-TOTAL_RESPONDENTS = df["id"].nunique()
+# Survey years: one engine per selected set, so a single-year view reads
+# that year's partition only. Engines live in survey.data, loaded once per
+# process and shared with the Game page and every session.
+if len(config.YEARS) > 1:
+    YEARS = tuple(sorted(st.sidebar.multiselect(
+        "📅 Survey year", config.YEARS, default=[config.CURRENT_YEAR]
+    ))) or (config.CURRENT_YEAR,)
+else:
+    YEARS = tuple(config.YEARS)
+YEAR_LABEL = str(YEARS[0]) if len(YEARS) == 1 else f"{YEARS[0]}–{YEARS[-1]}"
+
+# Every aggregate below goes through the engine (see survey.cube.CubeEngine
+# and survey.duckdb_engine.DuckDBEngine, selected with SURVEY_ENGINE),
+# memoized per filter state by survey.cache.CachedEngine
+engine = survey_data.engine(YEARS)
+TOTAL_RESPONDENTS = engine.total()
 
 
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
 def count_distinct(data, group_col, sort=True, top_n=None):
-    """Count distinct respondents per group."""
-    result = data.groupby(group_col)["id"].nunique().reset_index()
-    result.columns = [group_col, "respondents"]
-    result["pct"] = (result["respondents"] / data["id"].nunique() * 100).round(1)
-    if sort:
-        result = result.sort_values("respondents", ascending=False)
-    if top_n:
-        result = result.head(top_n)
-    return result
+    """Count distinct respondents per group (ordinal dimensions in their declared order).
+
+    `data` is either the sidebar `selections` or a cohort returned by
+    engine.split().
+    """
+    return tables.distribution(engine, data, group_col, sort, top_n)
 
 
 def bar_chart(data, x_col, y_col="respondents", color=ACCENT, title="",
@@ -113,12 +95,7 @@ def bar_chart(data, x_col, y_col="respondents", color=ACCENT, title="",
 
 def comparison_chart(data, group_col, compare_col, title="", height=450):
     """Grouped bar chart comparing distributions across a compare dimension."""
-    ct = data.groupby([compare_col, group_col])["id"].nunique().reset_index()
-    ct.columns = [compare_col, group_col, "respondents"]
-    totals = data.groupby(compare_col)["id"].nunique().reset_index()
-    totals.columns = [compare_col, "total"]
-    ct = ct.merge(totals, on=compare_col)
-    ct["pct"] = (ct["respondents"] / ct["total"] * 100).round(1)
+    ct = tables.comparison(engine, data, group_col, compare_col)
 
     fig = px.bar(
         ct, x=group_col, y="pct", color=compare_col,
@@ -146,129 +123,156 @@ def comparison_chart(data, group_col, compare_col, title="", height=450):
 st.sidebar.title("🔍 Filters")
 
 # Role filter
-roles = sorted(df["role_clean"].unique())
+roles = engine.values("role_clean")
 selected_roles = st.sidebar.multiselect("Role", roles, default=roles)
 
 # Org size filter
-sizes = ["< 50 employees", "50–199", "200–999", "1,000–10,000", "10,000+"]
+sizes = engine.values("org_size")
 selected_sizes = st.sidebar.multiselect("Org Size", sizes, default=sizes)
 
 # Industry filter
-industries = sorted(df["industry"].unique())
+industries = engine.values("industry")
 selected_industries = st.sidebar.multiselect("Industry", industries, default=industries)
 
 # Region filter
-regions = sorted(df["region"].unique())
+regions = engine.values("region")
 selected_regions = st.sidebar.multiselect("Region", regions, default=regions)
 
 # AI usage filter
-ai_freqs = ["Multiple times per day", "Daily", "Weekly", "Rarely", "Never"]
+ai_freqs = engine.values("ai_usage_frequency")
 selected_ai = st.sidebar.multiselect("AI Usage Frequency", ai_freqs, default=ai_freqs)
 
 # Management filter
-mgmt = sorted(df["management_vs_non"].unique())
+mgmt = engine.values("management_vs_non")
 selected_mgmt = st.sidebar.multiselect("Management vs Non", mgmt, default=mgmt)
 
-# Apply filters
-filtered = df[
-    (df["role_clean"].isin(selected_roles)) &
-    (df["org_size"].isin(selected_sizes)) &
-    (df["industry"].isin(selected_industries)) &
-    (df["region"].isin(selected_regions)) &
-    (df["ai_usage_frequency"].isin(selected_ai)) &
-    (df["management_vs_non"].isin(selected_mgmt))
-]
-
-n_filtered = filtered["id"].nunique()
+# Filter state: OR within a filter, AND across filters
+selections = {
+    "role_clean": selected_roles,
+    "org_size": selected_sizes,
+    "industry": selected_industries,
+    "region": selected_regions,
+    "ai_usage_frequency": selected_ai,
+    "management_vs_non": selected_mgmt,
+}
+n_filtered = engine.size(selections)
 st.sidebar.markdown("---")
 
 
 # ============================================================
 # HEADER
 # ============================================================
-st.title("2026 State of Data Engineering")
+st.title(f"{YEAR_LABEL} State of Data Engineering")
 st.caption(f"Survey Explorer · {n_filtered:,} of {TOTAL_RESPONDENTS:,} respondents · All metrics use COUNT(DISTINCT id)")
 
 # ============================================================
 # TABS
 # ============================================================
-tab_overview, tab_infra, tab_ai, tab_modeling, tab_challenges, tab_cohorts, tab_crosstab = st.tabs([
+# Each tab is a render function; only the selected one runs (see RENDER)
+TAB_LABELS = [
     "📋 Overview", "🏗️ Infrastructure", "🤖 AI Adoption",
     "📐 Modeling", "🔥 Challenges", "🧬 Cohort Analysis", "📊 Crosstab"
-])
+]
+
+# Cohorts are expressions over any dimension (see survey.cohort); the
+# examples are pain-point pairs. Combinations of multi-select options are
+# mined on demand (survey.itemsets) rather than stored as pair columns
+COHORT_EXAMPLES = [
+    str(c) for c in cohort.combinations(
+        "modeling_pain_points", config.MULTI_SELECT_OPTIONS["modeling_pain_points"][:4], 2
+    )
+] + [
+    'team_focus = "Fighting fires" and not org_size in ("< 50 employees", "50–199")',
+    'ai_usage_frequency = "Multiple times per day" or ai_helps_with = "Data modeling"',
+]
+COHORT_DIMENSIONS = [
+    "bottleneck_clean", "team_growth_2026", "ai_adoption",
+    "modeling_clean", "architecture_clean", "org_size",
+    "industry", "role_clean", "region",
+]
+
+# Widgets of a hidden tab are not rendered, and Streamlit drops their state;
+# re-assigning it every run keeps the choices across tab switches
+TAB_STATE = {
+    "cohort_mode": "One cohort vs the rest",
+    "cohort_expr": COHORT_EXAMPLES[1],
+    "cohort_fields": list(config.MULTI_SELECT),
+    "cohort_support": 5.0,
+    "cohort_max_size": 3,
+    "cohort_dim": COHORT_DIMENSIONS[0],
+    "crosstab_rows": config.DIMENSIONS[0],
+    "crosstab_cols": config.DIMENSIONS[3],
+    "crosstab_show_as": "Column %",
+    "crosstab_heatmap": True,
+    "crosstab_yoy": False,
+    "cohort_yoy": False,
+}
+for key, default in TAB_STATE.items():
+    st.session_state[key] = st.session_state.get(key, default)
 
 # ============================================================
 # TAB: OVERVIEW
 # ============================================================
-with tab_overview:
+def render_overview():
     col1, col2, col3, col4 = st.columns(4)
 
-    daily_ai = filtered[filtered["ai_usage_frequency"].isin(["Multiple times per day", "Daily"])]["id"].nunique()
+    daily_ai = engine.count_where(selections, "ai_usage_frequency", ["Multiple times per day", "Daily"])
     col1.metric("Daily AI Users", f"{daily_ai/n_filtered*100:.0f}%")
 
-    legacy = filtered[filtered["bottleneck_clean"] == "Legacy / tech debt"]["id"].nunique()
+    legacy = engine.count_where(selections, "bottleneck_clean", ["Legacy / tech debt"])
     col2.metric("#1 Bottleneck: Legacy Debt", f"{legacy/n_filtered*100:.0f}%")
 
-    grow = filtered[filtered["team_growth_2026"] == "Grow"]["id"].nunique()
+    grow = engine.count_where(selections, "team_growth_2026", ["Grow"])
     col3.metric("Expect Team Growth", f"{grow/n_filtered*100:.0f}%")
 
-    fires = filtered[filtered["fights_fires"] == True]["id"].nunique()
+    fires = engine.count_where(selections, "fights_fires", [True])
     col4.metric("Fighting Fires", f"{fires/n_filtered*100:.0f}%")
 
     st.markdown("---")
 
     c1, c2 = st.columns(2)
     with c1:
-        role_data = count_distinct(filtered, "role_clean", top_n=10)
+        role_data = count_distinct(selections, "role_clean", top_n=10)
         st.plotly_chart(bar_chart(role_data, "role_clean", title="By Role (top 10)"),
                        use_container_width=True)
     with c2:
-        ind_data = count_distinct(filtered, "industry")
+        ind_data = count_distinct(selections, "industry")
         st.plotly_chart(bar_chart(ind_data, "industry", color=ACCENT2, title="By Industry"),
                        use_container_width=True)
 
     c3, c4 = st.columns(2)
     with c3:
-        size_data = count_distinct(filtered, "org_size")
-        # Reorder
-        size_order = ["< 50 employees", "50–199", "200–999", "1,000–10,000", "10,000+"]
-        size_data["org_size"] = pd.Categorical(size_data["org_size"], categories=size_order, ordered=True)
-        size_data = size_data.sort_values("org_size")
+        size_data = count_distinct(selections, "org_size")
         st.plotly_chart(bar_chart(size_data, "org_size", color=ACCENT3, title="By Org Size"),
                        use_container_width=True)
     with c4:
-        reg_data = count_distinct(filtered, "region")
+        reg_data = count_distinct(selections, "region")
         st.plotly_chart(bar_chart(reg_data, "region", color="#ff4777", title="By Region"),
                        use_container_width=True)
 
 # ============================================================
 # TAB: INFRASTRUCTURE
 # ============================================================
-with tab_infra:
+def render_infra():
     c1, c2 = st.columns(2)
     with c1:
-        storage_data = count_distinct(filtered, "Category")
+        storage_data = count_distinct(selections, "Category")
         st.plotly_chart(bar_chart(storage_data, "Category", title="Storage Category"),
                        use_container_width=True)
     with c2:
-        arch_data = count_distinct(filtered, "architecture_clean")
+        arch_data = count_distinct(selections, "architecture_clean")
         st.plotly_chart(bar_chart(arch_data, "architecture_clean", color=ACCENT2,
                                   title="Architecture Trend"),
                        use_container_width=True)
 
     c3, c4 = st.columns(2)
     with c3:
-        orch_data = count_distinct(filtered, "orchestration_clean", top_n=12)
+        orch_data = count_distinct(selections, "orchestration_clean", top_n=12)
         st.plotly_chart(bar_chart(orch_data, "orchestration_clean", color=ACCENT3,
                                   title="Orchestration (top 12)", height=500),
                        use_container_width=True)
     with c4:
-        growth_data = count_distinct(filtered, "team_growth_2026")
-        order = ["Grow", "Stay the same", "Shrink", "Not sure"]
-        growth_data["team_growth_2026"] = pd.Categorical(
-            growth_data["team_growth_2026"], categories=order, ordered=True
-        )
-        growth_data = growth_data.sort_values("team_growth_2026")
+        growth_data = count_distinct(selections, "team_growth_2026")
         st.plotly_chart(bar_chart(growth_data, "team_growth_2026", color="#ffb800",
                                   title="Team Growth 2026"),
                        use_container_width=True)
@@ -276,25 +280,20 @@ with tab_infra:
 # ============================================================
 # TAB: AI ADOPTION
 # ============================================================
-with tab_ai:
+def render_ai():
     c1, c2 = st.columns(2)
     with c1:
-        freq_data = count_distinct(filtered, "ai_usage_frequency")
-        freq_order = ["Multiple times per day", "Daily", "Weekly", "Rarely", "Never"]
-        freq_data["ai_usage_frequency"] = pd.Categorical(
-            freq_data["ai_usage_frequency"], categories=freq_order, ordered=True
-        )
-        freq_data = freq_data.sort_values("ai_usage_frequency")
+        freq_data = count_distinct(selections, "ai_usage_frequency")
         st.plotly_chart(bar_chart(freq_data, "ai_usage_frequency", title="AI Usage Frequency"),
                        use_container_width=True)
     with c2:
-        adopt_data = count_distinct(filtered, "ai_adoption")
+        adopt_data = count_distinct(selections, "ai_adoption")
         st.plotly_chart(bar_chart(adopt_data, "ai_adoption", color=ACCENT2,
                                   title="Organizational AI Adoption"),
                        use_container_width=True)
 
     st.markdown("---")
-    helps_data = count_distinct(filtered, "ai_helps_with")
+    helps_data = count_distinct(selections, "ai_helps_with")
     st.plotly_chart(bar_chart(helps_data, "ai_helps_with", color=ACCENT3,
                               title="What AI Helps With (multi-select, exploded)"),
                    use_container_width=True)
@@ -302,20 +301,20 @@ with tab_ai:
 # ============================================================
 # TAB: MODELING
 # ============================================================
-with tab_modeling:
+def render_modeling():
     c1, c2 = st.columns(2)
     with c1:
-        model_data = count_distinct(filtered, "modeling_clean")
+        model_data = count_distinct(selections, "modeling_clean")
         st.plotly_chart(bar_chart(model_data, "modeling_clean", title="Modeling Approach"),
                        use_container_width=True)
     with c2:
-        pain_data = count_distinct(filtered, "modeling_pain_points")
+        pain_data = count_distinct(selections, "modeling_pain_points")
         st.plotly_chart(bar_chart(pain_data, "modeling_pain_points", color="#ff4777",
                                   title="Modeling Pain Points (multi-select, exploded)"),
                        use_container_width=True)
 
     st.markdown("---")
-    edu_data = count_distinct(filtered, "education_clean")
+    edu_data = count_distinct(selections, "education_clean")
     st.plotly_chart(bar_chart(edu_data, "education_clean", color=ACCENT3,
                               title="Desired Training Topics"),
                    use_container_width=True)
@@ -323,14 +322,14 @@ with tab_modeling:
 # ============================================================
 # TAB: CHALLENGES
 # ============================================================
-with tab_challenges:
+def render_challenges():
     c1, c2 = st.columns(2)
     with c1:
-        bottle_data = count_distinct(filtered, "bottleneck_clean")
+        bottle_data = count_distinct(selections, "bottleneck_clean")
         st.plotly_chart(bar_chart(bottle_data, "bottleneck_clean", title="Biggest Bottleneck"),
                        use_container_width=True)
     with c2:
-        focus_data = count_distinct(filtered, "team_focus")
+        focus_data = count_distinct(selections, "team_focus")
         st.plotly_chart(bar_chart(focus_data, "team_focus", color=ACCENT2,
                                   title="Team Focus (multi-select, exploded)"),
                        use_container_width=True)
@@ -338,7 +337,7 @@ with tab_challenges:
     st.markdown("---")
     st.subheader("Bottleneck by Role")
     st.plotly_chart(
-        comparison_chart(filtered, "bottleneck_clean", "role_clean",
+        comparison_chart(selections, "bottleneck_clean", "role_clean",
                         title="Bottleneck distribution by Role (top roles)"),
         use_container_width=True,
     )
@@ -346,47 +345,44 @@ with tab_challenges:
 # ============================================================
 # TAB: COHORT ANALYSIS
 # ============================================================
-with tab_cohorts:
-    st.subheader("Pain Point Pair Cohorts")
-    st.caption("Compare respondents who have a specific pain point pair vs. those who don't.")
-
-    # Build cohort selector from the individual pairs (not the pipe-delimited combos)
-    all_pairs = [
-        "Lack of ownership + Move fast pressure",
-        "Hard to maintain + Move fast pressure",
-        "Hard to maintain + Lack of ownership",
-        "Move fast pressure + Tools inadequate",
-        "Lack of ownership + Tools inadequate",
-        "Hard to maintain + Tools inadequate",
-    ]
-    selected_pair = st.selectbox("Select a pain point pair", all_pairs)
-
-    # Since pain_point_pair is pipe-delimited, use str.contains with regex=False
-    cohort_has = filtered[filtered["pain_point_pair"].str.contains(selected_pair, na=False, regex=False)]
-    cohort_not = filtered[~filtered["pain_point_pair"].str.contains(selected_pair, na=False, regex=False)]
-
-    n_has = cohort_has["id"].nunique()
-    n_not = cohort_not["id"].nunique()
-
-    c1, c2, c3 = st.columns(3)
-    c1.metric("Has Pair", f"{n_has:,}", f"{n_has/n_filtered*100:.1f}%")
-    c2.metric("Doesn't Have Pair", f"{n_not:,}", f"{n_not/n_filtered*100:.1f}%")
-    c3.metric("Total Filtered", f"{n_filtered:,}")
+def render_cohorts():
+    st.subheader("Cohorts")
+    mode = st.radio("View", ["One cohort vs the rest", "Frequent combinations"],
+                    horizontal=True, key="cohort_mode")
+    compare_dim = st.selectbox("Compare across", COHORT_DIMENSIONS, key="cohort_dim")
+    if mode == "One cohort vs the rest":
+        render_cohort_split(compare_dim)
+    else:
+        render_cohort_combinations(compare_dim)
 
-    # Compare across a chosen dimension
-    compare_dim = st.selectbox("Compare across", [
-        "bottleneck_clean", "team_growth_2026", "ai_adoption",
-        "modeling_clean", "architecture_clean", "org_size",
-        "industry", "role_clean", "region",
-    ])
 
-    # Build comparison data
-    has_dist = count_distinct(cohort_has, compare_dim)
-    has_dist["cohort"] = f"Has: {selected_pair}"
-    not_dist = count_distinct(cohort_not, compare_dim)
-    not_dist["cohort"] = f"Doesn't have pair"
+def render_cohort_split(compare_dim):
+    st.caption("Compare respondents matching a cohort definition vs. those who don't.")
+    text = st.text_input("Cohort definition", key="cohort_expr")
+    with st.expander("Syntax and examples"):
+        st.markdown(
+            '`column = "value"`, `column != "value"`, `column in ("a", "b")`, combined with '
+            "`and`, `or`, `not` and parentheses. On multi-select fields (`team_focus`, "
+            "`modeling_pain_points`, `ai_helps_with`) `=` means the option was selected."
+        )
+        st.code("\n".join(COHORT_EXAMPLES), language="sql")
+    try:
+        selected = cohort.parse(text)
+    except ValueError as exc:
+        st.error(f"Invalid cohort: {exc}")
+        return
+
+    # Both sides in one pass over the respondent bitsets (or one SQL query);
+    # the sizes come from the same cached comparison
+    cohorts = [selected.named("In cohort"), (~selected).named("Rest")]
+    combined = tables.cohort_comparison(engine, selections, cohorts, compare_dim)
+    sizes = engine.compare(selections, cohorts, compare_dim)["respondents"]
+    n_has, n_not = int(sizes.iloc[0]), int(sizes.iloc[1])
 
-    combined = pd.concat([has_dist, not_dist])
+    c1, c2, c3 = st.columns(3)
+    c1.metric("In Cohort", f"{n_has:,}", f"{n_has/n_filtered*100:.1f}%")
+    c2.metric("Rest", f"{n_not:,}", f"{n_not/n_filtered*100:.1f}%")
+    c3.metric("Total Filtered", f"{n_filtered:,}")
 
     fig = px.bar(
         combined, x=compare_dim, y="pct", color="cohort",
@@ -408,42 +404,82 @@ with tab_cohorts:
     fig.update_xaxes(tickangle=-45)
     st.plotly_chart(fig, use_container_width=True)
 
+    # Year over year: the cohort, split by survey year
+    if len(YEARS) > 1 and st.checkbox("Compare survey years", key="cohort_yoy"):
+        cohort_has, _ = engine.split(selections, selected)
+        st.plotly_chart(
+            comparison_chart(cohort_has, compare_dim, "survey_year",
+                             title=f"{compare_dim} — cohort by year"),
+            use_container_width=True,
+        )
+
+
+def render_cohort_combinations(compare_dim):
+    st.caption("Options of the multi-select fields that respondents pick together, "
+               "mined for the current filters. Lift > 1: picked together more often "
+               "than if unrelated.")
+    c1, c2, c3 = st.columns([2, 1, 1])
+    fields = c1.multiselect("Fields", config.MULTI_SELECT, key="cohort_fields")
+    min_support = c2.number_input("Min support (%)", min_value=0.5, max_value=100.0,
+                                  step=0.5, key="cohort_support")
+    max_size = c3.radio("Up to", [2, 3, 4], horizontal=True, key="cohort_max_size",
+                        format_func=lambda k: f"{k} options")
+
+    found = itemsets.mine(engine, selections, fields or None, min_support / 100, max_size)
+    if found.empty:
+        st.info("No combination reaches that support under the current filters.")
+        return
+    st.dataframe(found.drop(columns="items"), use_container_width=True, hide_index=True,
+                 height=min(400, 35 * (len(found) + 1)))
+
+    # Prevalence of the top combinations in every group of the compared dimension
+    top = found.head(20)
+    pivot = itemsets.prevalence(engine, selections, top, compare_dim).pivot_table(
+        index="itemset", columns=compare_dim, values="pct", fill_value=0, observed=True,
+    ).reindex(top["itemset"])
+    fig = px.imshow(
+        pivot.values,
+        labels=dict(x=compare_dim, y="combination", color="% of group"),
+        x=list(pivot.columns),
+        y=list(pivot.index),
+        color_continuous_scale="Oranges",
+        aspect="auto",
+    )
+    fig.update_layout(
+        title=f"Top combinations — % of each {compare_dim} group",
+        height=max(400, len(pivot) * 35),
+        font=dict(family="JetBrains Mono, monospace", size=11),
+        margin=dict(l=10, r=10, t=40, b=10),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
 # ============================================================
 # TAB: CROSSTAB
 # ============================================================
-with tab_crosstab:
+def render_crosstab():
     st.subheader("Custom Crosstab")
     st.caption("Cross-tabulate any two dimensions. Values = COUNT(DISTINCT id).")
 
-    available_dims = [
-        "role_clean", "org_size", "industry", "region",
-        "ai_usage_frequency", "ai_adoption", "team_focus",
-        "modeling_clean", "modeling_pain_points", "ai_helps_with",
-        "architecture_clean", "bottleneck_clean", "orchestration_clean",
-        "team_growth_2026", "education_clean", "management_vs_non",
-        "Category", "fights_fires",
-    ]
+    available_dims = config.DIMENSIONS
 
     c1, c2 = st.columns(2)
-    row_dim = c1.selectbox("Rows", available_dims, index=0)
-    col_dim = c2.selectbox("Columns", available_dims, index=3)
+    row_dim = c1.selectbox("Rows", available_dims, key="crosstab_rows")
+    col_dim = c2.selectbox("Columns", available_dims, key="crosstab_cols")
 
-    show_as = st.radio("Show as", ["Column %", "Count"], horizontal=True)
+    show_as = st.radio("Show as", ["Column %", "Count"], horizontal=True, key="crosstab_show_as")
 
-    # Build crosstab using distinct IDs
-    ct = filtered.groupby([row_dim, col_dim])["id"].nunique().reset_index()
-    ct.columns = [row_dim, col_dim, "count"]
-    pivot = ct.pivot_table(index=row_dim, columns=col_dim, values="count", fill_value=0)
+    # Year over year: rows as % of each year's respondents, plus the latest change
+    if len(YEARS) > 1 and st.checkbox("Year over year (rows by survey year)", key="crosstab_yoy"):
+        st.dataframe(tables.year_over_year(engine, selections, row_dim),
+                     use_container_width=True)
 
-    if show_as == "Row %":
-        pivot = pivot.div(pivot.sum(axis=1), axis=0).multiply(100).round(1)
-    elif show_as == "Column %":
-        pivot = pivot.div(pivot.sum(axis=0), axis=1).multiply(100).round(1)
+    # Build crosstab using distinct IDs (cube lookup, or live on the selection)
+    pivot = tables.crosstab(engine, selections, row_dim, col_dim, show_as)
 
     st.dataframe(pivot, use_container_width=True, height=500)
 
     # Heatmap
-    if st.checkbox("Show heatmap", value=True):
+    if st.checkbox("Show heatmap", key="crosstab_heatmap"):
         fig = px.imshow(
             pivot.values,
             labels=dict(x=col_dim, y=row_dim, color=show_as),
@@ -460,12 +496,33 @@ with tab_crosstab:
         st.plotly_chart(fig, use_container_width=True)
 
 
+# ============================================================
+# RENDER
+# ============================================================
+# With lazy tabs, st.tabs tracks the selected tab (rerunning on a switch) and
+# only that tab's charts are computed; `.open` is None when tracking is off,
+# in which case every tab renders as before
+RENDERERS = [render_overview, render_infra, render_ai, render_modeling,
+             render_challenges, render_cohorts, render_crosstab]
+tabs = st.tabs(TAB_LABELS, key="explorer_tab",
+               on_change="rerun" if config.LAZY_TABS else "ignore")
+for tab, render in zip(tabs, RENDERERS):
+    if tab.open is not False:
+        with tab:
+            render()
+
+
 # ============================================================
 # FOOTER
 # ============================================================
+# Fielding period of each survey year, where known
+FIELD_PERIODS = {2026: "Dec 2025 – Jan 2026"}
+periods = [FIELD_PERIODS[year] for year in YEARS if year in FIELD_PERIODS]
+
 st.markdown("---")
 st.caption(
-    "Data: 2026 Practical Data Community State of Data Engineering Survey (Joe Reis) · "
-    "1,101 respondents · Dec 2025 – Jan 2026 · "
-    "All metrics use COUNT(DISTINCT id) on the exploded dataset."
+    f"Data: {YEAR_LABEL} Practical Data Community State of Data Engineering Survey (Joe Reis) · "
+    f"{TOTAL_RESPONDENTS:,} respondents · "
+    + "".join(f"{period} · " for period in periods)
+    + "All metrics use COUNT(DISTINCT id) on the exploded dataset."
 )
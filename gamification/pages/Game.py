@@ -1,8 +1,9 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
 import random
 
+from survey import data as survey_data
+
 # ============================================================
 # CONFIG
 # ============================================================
@@ -83,27 +84,6 @@ header {visibility: hidden;}
 """, unsafe_allow_html=True)
 
 
-# ============================================================
-# LOAD DATA
-# ============================================================
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/expanded.csv")
-    if "Unnamed: 0" in df.columns:
-        df = df.drop(columns=["Unnamed: 0"])
-    return df
-
-
-@st.cache_data
-def get_base():
-    return load_data().drop_duplicates("id")
-
-
-df = load_data()
-base = get_base()
-TOTAL = base["id"].nunique()
-
-
 # ============================================================
 # CHART BUILDER
 # ============================================================
@@ -144,252 +124,22 @@ def reveal_bar_chart(labels, values, highlight_label=None, highlight_label_2=Non
 # ============================================================
 # QUESTION BANK
 # ============================================================
-@st.cache_data
+# Compiled by the pipeline and shared process-wide (survey.data); read on
+# first use (the menu's survey facts), never the survey data itself
 def build_hl_questions():
-    """Build all Higher/Lower questions with chart data embedded."""
-    questions = []
-
-    def add_comparison(stats_dict, context, category, chart_title):
-        """From a dict of {label: pct}, generate question pairs."""
-        items = list(stats_dict.items())
-        pairs = [(a, b) for a, b in [(items[i], items[j])
-                  for i in range(len(items)) for j in range(len(items)) if i != j]]
-        for (anchor_label, anchor_val), (compare_label, compare_val) in pairs:
-            questions.append({
-                "anchor_label": anchor_label,
-                "anchor_value": anchor_val,
-                "compare_label": compare_label,
-                "compare_value": compare_val,
-                "context": context,
-                "category": category,
-                "chart_labels": list(stats_dict.keys()),
-                "chart_values": list(stats_dict.values()),
-                "chart_title": chart_title,
-            })
-
-    # 1. Bottleneck by role
-    for bn in ["Legacy / tech debt", "Lack of leadership", "Poor requirements", "Data quality"]:
-        stats = {}
-        for role in ["Data Engineer", "Analytics Engineer", "Manager / Director / VP", "Data Architect"]:
-            r = base[base["role_clean"] == role]
-            stats[role] = round((r["bottleneck_clean"] == bn).mean() * 100, 1)
-        add_comparison(stats, f'say **"{bn}"** is their biggest bottleneck',
-                      "Bottleneck × Role", f'"{bn}" by Role')
-
-    # 2. Fire-fighting by industry
-    stats = {}
-    for ind in sorted(base["industry"].unique()):
-        r = base[base["industry"] == ind]
-        stats[ind] = round(r["fights_fires"].mean() * 100, 1)
-    add_comparison(stats, "teams report **fighting fires**", "Fires × Industry",
-                  "Fire-fighting rate by Industry")
-
-    # 3. Ad-hoc modeling by industry
-    stats = {}
-    for ind in sorted(base["industry"].unique()):
-        r = base[base["industry"] == ind]
-        stats[ind] = round((r["modeling_clean"] == "Ad-hoc").mean() * 100, 1)
-    add_comparison(stats, "use **ad-hoc modeling**", "Modeling × Industry",
-                  "Ad-hoc modeling by Industry")
-
-    # 4. Growth by bottleneck
-    # 5. No orchestration by org size
-    stats = {}
-    for size in ["< 50 employees", "50–199", "200–999", "1,000–10,000", "10,000+"]:
-        r = base[base["org_size"] == size]
-        stats[size] = round((r["orchestration_clean"] == "No orchestration / ad-hoc").mean() * 100, 1)
-    add_comparison(stats, "have **no orchestration**", "Orchestration × Org Size",
-                  "No orchestration rate by Org Size")
-
-    # 6. Management self-awareness
-    stats = {}
-    for m in ["Management", "Non-Management"]:
-        r = base[base["management_vs_non"] == m]
-        stats[m] = round((r["bottleneck_clean"] == "Lack of leadership").mean() * 100, 1)
-    add_comparison(stats, 'cite **"Lack of leadership"** as bottleneck',
-                  "Self-awareness", "Leadership bottleneck: Mgmt vs IC")
-
-    # 8. AI daily usage by industry
-    stats = {}
-    for ind in sorted(base["industry"].unique()):
-        r = base[base["industry"] == ind]
-        stats[ind] = round(r["ai_usage_frequency"].isin(["Multiple times per day", "Daily"]).mean() * 100, 1)
-    add_comparison(stats, "use AI tools **daily or more**", "AI Usage × Industry",
-                  "Daily+ AI usage by Industry")
-
-
-    # 10. Fire-fighting by org size
-    stats = {}
-    for size in ["< 50 employees", "50–199", "200–999", "1,000–10,000", "10,000+"]:
-        r = base[base["org_size"] == size]
-        stats[size] = round(r["fights_fires"].mean() * 100, 1)
-    add_comparison(stats, "teams report **fighting fires**", "Fires × Org Size",
-                  "Fire-fighting rate by Org Size")
-
-    return questions
-
-
-@st.cache_data
+    """All Higher/Lower questions, decoded from the stats on access."""
+    return survey_data.hl_bank()
+
+
 def build_guess_questions():
-    """Build Guess the Number questions with chart data."""
-    questions = []
-
-    # Helper to build a distribution dict
-    def dist(col, val, group_col):
-        stats = {}
-        for g in sorted(base[group_col].unique()):
-            r = base[base[group_col] == g]
-            stats[g] = round((r[col] == val).mean() * 100, 1)
-        return stats
-
-    questions.append({
-        "question": "What % of data professionals use AI tools **daily or more**?",
-        "answer": round(base["ai_usage_frequency"].isin(["Multiple times per day", "Daily"]).mean() * 100, 1),
-        "hint": "Think about ChatGPT, Copilot, Claude adoption...",
-        "reveal": "AI is table stakes. Only 1% never use AI tools at all.",
-        "category": "AI Adoption",
-        "chart_labels": ["Multiple times/day", "Daily", "Weekly", "Rarely", "Never"],
-        "chart_values": [
-            round((base["ai_usage_frequency"] == f).mean() * 100, 1)
-            for f in ["Multiple times per day", "Daily", "Weekly", "Rarely", "Never"]
-        ],
-        "chart_title": "AI Usage Frequency (all respondents)",
-        "highlight": None,
-    })
-
-    questions.append({
-        "question": "What % of respondents report **fighting fires** as a primary focus for the team?",
-        "answer": round(base["fights_fires"].mean() * 100, 1),
-        "hint": "More than 1 in 5, but less than 1 in 2...",
-        "reveal": "Over a quarter of data teams spend significant time firefighting.",
-        "category": "Team Focus",
-        "chart_labels": list(dist("fights_fires", True, "industry").keys()),
-        "chart_values": list(dist("fights_fires", True, "industry").values()),
-        "chart_title": "Fire-fighting rate by Industry",
-        "highlight": None,
-    })
-
-    questions.append({
-        "question": "What % cite **legacy / tech debt** as their #1 bottleneck?",
-        "answer": round((base["bottleneck_clean"] == "Legacy / tech debt").mean() * 100, 1),
-        "hint": "It's the single biggest bottleneck in the survey.",
-        "reveal": "The #1 bottleneck, beating leadership and requirements.",
-        "category": "Challenges",
-        "chart_labels": list(base["bottleneck_clean"].value_counts().head(7).index),
-        "chart_values": [round(v / TOTAL * 100, 1) for v in base["bottleneck_clean"].value_counts().head(7).values],
-        "chart_title": "Top bottlenecks (all respondents)",
-        "highlight": "Legacy / tech debt",
-    })
-
-    questions.append({
-        "question": "What % of **10,000+ employee** orgs have **no orchestration**?",
-        "answer": round((base[base["org_size"] == "10,000+"]["orchestration_clean"] == "No orchestration / ad-hoc").mean() * 100, 1),
-        "hint": "Surprisingly close to startup rates...",
-        "reveal": "Enterprise ≠ mature infrastructure. Nearly identical to startups.",
-        "category": "Infrastructure",
-        "chart_labels": ["< 50 emp", "50–199", "200–999", "1K–10K", "10,000+"],
-        "chart_values": [
-            round((base[base["org_size"] == s]["orchestration_clean"] == "No orchestration / ad-hoc").mean() * 100, 1)
-            for s in ["< 50 employees", "50–199", "200–999", "1,000–10,000", "10,000+"]
-        ],
-        "chart_title": "No orchestration rate by Org Size",
-        "highlight": "10,000+",
-    })
-
-    questions.append({
-        "question": "What % of **Healthcare** orgs use **ad-hoc modeling**?",
-        "answer": round((base[base["industry"] == "Healthcare"]["modeling_clean"] == "Ad-hoc").mean() * 100, 1),
-        "hint": "The most regulated industries aren't always the most disciplined...",
-        "reveal": "The most regulated industry has the messiest modeling.",
-        "category": "Modeling",
-        "chart_labels": list(dist("modeling_clean", "Ad-hoc", "industry").keys()),
-        "chart_values": list(dist("modeling_clean", "Ad-hoc", "industry").values()),
-        "chart_title": "Ad-hoc modeling rate by Industry",
-        "highlight": "Healthcare",
-    })
-
-    questions.append({
-        "question": "What % of teams expect to **shrink** in 2026?",
-        "answer": round((base["team_growth_2026"] == "Shrink").mean() * 100, 1),
-        "hint": "The field is generally optimistic...",
-        "reveal": "Cautious optimism. 42% expect growth vs only 7% shrinkage.",
-        "category": "Outlook",
-        "chart_labels": ["Grow", "Stay the same", "Shrink", "Not sure"],
-        "chart_values": [
-            round((base["team_growth_2026"] == g).mean() * 100, 1)
-            for g in ["Grow", "Stay the same", "Shrink", "Not sure"]
-        ],
-        "chart_title": "Team growth expectations 2026",
-        "highlight": "Shrink",
-    })
-
-    questions.append({
-        "question": "What % say **modeling is going well** (no pain points)?",
-        "answer": 11.3,
-        "hint": "Joe Reis called modeling 'in crisis'...",
-        "reveal": "Nearly 90% report at least one modeling pain point.",
-        "category": "Modeling",
-        "chart_labels": list(df.groupby("modeling_pain_points")["id"].nunique().sort_values(ascending=False).index),
-        "chart_values": [round(v / TOTAL * 100, 1) for v in df.groupby("modeling_pain_points")["id"].nunique().sort_values(ascending=False).values],
-        "chart_title": "Modeling pain points (multi-select)",
-        "highlight": "None / modeling is going well",
-    })
-
-    questions.append({
-        "question": "What % of **Manufacturing** teams report **fighting fires**?",
-        "answer": round(base[base["industry"] == "Manufacturing / Industrial"]["fights_fires"].mean() * 100, 1),
-        "hint": "Think factories, supply chains, legacy SCADA systems...",
-        "reveal": "Manufacturing and Finance lead in firefighting, far above Tech.",
-        "category": "Industry",
-        "chart_labels": list(dist("fights_fires", True, "industry").keys()),
-        "chart_values": list(dist("fights_fires", True, "industry").values()),
-        "chart_title": "Fire-fighting rate by Industry",
-        "highlight": "Manufacturing / Industrial",
-    })
-
-    questions.append({
-        "question": "What % of teams with **Talent / hiring** as bottleneck expect to **grow**?",
-        "answer": round((base[base["bottleneck_clean"] == "Talent / hiring"]["team_growth_2026"] == "Grow").mean() * 100, 1),
-        "hint": "If your only problem is hiring, things might be going well...",
-        "reveal": "The most bullish group. If talent is your only problem, the future is bright.",
-        "category": "Growth",
-        "chart_labels": list(dist("team_growth_2026", "Grow", "bottleneck_clean").keys()),
-        "chart_values": list(dist("team_growth_2026", "Grow", "bottleneck_clean").values()),
-        "chart_title": "% expecting growth, by bottleneck",
-        "highlight": "Talent / hiring",
-    })
-
-    questions.append({
-        "question": "What % of **Managers/VPs** cite **lack of leadership** as the bottleneck?",
-        "answer": round((base[base["management_vs_non"] == "Management"]["bottleneck_clean"] == "Lack of leadership").mean() * 100, 1),
-        "hint": "Do managers admit they're the problem?",
-        "reveal": "The self-awareness gap is only ~3pp. Managers largely agree.",
-        "category": "Self-awareness",
-        "chart_labels": ["Management", "Non-Management"],
-        "chart_values": [
-            round((base[base["management_vs_non"] == m]["bottleneck_clean"] == "Lack of leadership").mean() * 100, 1)
-            for m in ["Management", "Non-Management"]
-        ],
-        "chart_title": '"Lack of leadership" by Mgmt vs IC',
-        "highlight": "Management",
-    })
-
-    questions.append({
-        "question": "What % of teams building **AI platforms** expect to **shrink**?",
-        "answer": round((base[base["ai_adoption"] == "Building internal AI platforms"]["team_growth_2026"] == "Shrink").mean() * 100, 1),
-        "hint": "AI platforms might be replacing headcount...",
-        "reveal": "Building AI platforms correlates with shrinkage, not growth. The transition costs headcount.",
-        "category": "AI Paradox",
-        "chart_labels": list(base["ai_adoption"].unique()),
-        "chart_values": [
-            round((base[base["ai_adoption"] == ai]["team_growth_2026"] == "Shrink").mean() * 100, 1)
-            for ai in base["ai_adoption"].unique()
-        ],
-        "chart_title": "% expecting shrinkage by AI adoption",
-        "highlight": "Building internal AI platforms",
-    })
-
-    return questions
+    """Guess the Number questions with chart data."""
+    return survey_data.banks()["guess"]
+
+
+def survey_facts():
+    """(survey year, respondents) the questions were compiled from."""
+    banks = survey_data.banks()
+    return banks["survey_year"], banks["respondents"]
 
 
 # ============================================================
@@ -436,11 +186,12 @@ def reset_game():
 # MAIN MENU
 # ============================================================
 if st.session_state.game_mode is None:
+    survey_year, respondents = survey_facts()
     st.markdown("<h1 style='text-align:center; font-size: 2.5rem;'>🎮 Data Engineering:<br>The Game</h1>", unsafe_allow_html=True)
     st.markdown(
         "<p style='text-align:center; color: #7a7a94; font-style: italic; margin-bottom: 40px;'>"
-        "How well do you know the 2026 data engineering landscape?<br>"
-        "1,101 professionals answered. Can you predict what they said?</p>",
+        f"How well do you know the {survey_year} data engineering landscape?<br>"
+        f"{respondents:,} professionals answered. Can you predict what they said?</p>",
         unsafe_allow_html=True,
     )
 
@@ -464,7 +215,8 @@ if st.session_state.game_mode is None:
 
 
     st.markdown("---")
-    st.caption("Data: 2026 Practical Data Community State of Data Engineering Survey by Joe Reis · 1,101 respondents")
+    st.caption(f"Data: {survey_year} Practical Data Community State of Data Engineering Survey "
+               f"by Joe Reis · {respondents:,} respondents")
 
 
 # ============================================================
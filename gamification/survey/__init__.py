@@ -0,0 +1 @@
+"""Data layer for the 2026 DE survey app: build pipeline and loaders."""
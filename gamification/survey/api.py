@@ -0,0 +1,254 @@
+"""Headless HTTP API over the Explorer's aggregates (optional, `pip install starlette uvicorn`).
+
+    python -m survey.api --port 8000        # from gamification/
+
+Every endpoint answers from the same engine as the Explorer (survey.data,
+so SURVEY_ENGINE applies) and returns JSON. Sidebar filters are query
+parameters, repeated for several values; a filter left out selects every
+value, and `year` (repeatable) picks survey years as the Explorer does:
+
+    GET /health
+    GET /values/{col}                           values of a filter column
+    GET /size                                   respondents matching the filters
+    GET /distribution/{dim}?top_n=&sort=        tables.distribution
+    GET /comparison/{dim}/{compare}             tables.comparison
+    GET /crosstab/{rows}/{cols}?show_as=        tables.crosstab ("split" JSON)
+    GET /cohort/{dim}?cohort=                   a cohort (survey.cohort expression) vs the rest
+    GET /cohorts/{dim}?cohort=&cohort=          several cohorts side by side
+    GET /cohorts/{dim}?field=&k=                every k-option cohort of a multi-select field
+    GET /itemsets?field=&min_support=&max_size=&segment=
+                                                frequent option combinations (survey.itemsets),
+                                                with per-segment prevalence if segment is set
+    GET /yoy/{dim}                              tables.year_over_year
+
+    curl 'localhost:8000/distribution/bottleneck_clean?role_clean=Data%20Engineer'
+
+Engine calls run in a worker thread so the event loop keeps accepting
+requests, and whole responses are kept in an LRU keyed on the normalized
+request (on top of the engine's own aggregate cache). Rows added with
+survey.data.append drop the responses whose filters match a new respondent.
+"""
+import argparse
+import json
+
+from survey import cohort as survey_cohort, config, data, itemsets, tables
+from survey.cache import LRUCache, selection_key
+from survey.live import affected
+
+try:
+    from starlette.applications import Starlette
+    from starlette.concurrency import run_in_threadpool
+    from starlette.responses import JSONResponse, Response
+    from starlette.routing import Route
+except ImportError:  # optional dependency
+    Starlette = None
+
+RESPONSE_CACHE_SIZE = 4096
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _dimension(name):
+    if name not in config.DIMENSIONS:
+        raise BadRequest(f"unknown dimension {name!r}; one of {config.DIMENSIONS}")
+    return name
+
+
+def _request_state(params):
+    """(years, {filter column: values}) from query parameters."""
+    years = tuple(sorted(int(y) for y in params.getlist("year"))) or (config.CURRENT_YEAR,)
+    unknown = set(years).difference(config.YEARS)
+    if unknown:
+        raise BadRequest(f"no survey for year(s) {sorted(unknown)}")
+    engine = data.engine(years)
+    selections = {col: params.getlist(col) or engine.values(col) for col in config.FILTER_COLUMNS}
+    return engine, selections
+
+
+def _frame(frame, orient="records"):
+    return frame.to_json(orient=orient, force_ascii=False)
+
+
+# ============================================================
+# ENDPOINTS
+# ============================================================
+# Each handler takes (path params, query params) and returns a JSON string
+def values(path, params):
+    col = path["col"]
+    if col not in config.FILTER_COLUMNS:
+        raise BadRequest(f"unknown filter column {col!r}; one of {config.FILTER_COLUMNS}")
+    engine, _ = _request_state(params)
+    return json.dumps([str(v) for v in engine.values(col)], ensure_ascii=False)
+
+
+def size(path, params):
+    engine, selections = _request_state(params)
+    return str(engine.size(selections))
+
+
+def distribution(path, params):
+    engine, selections = _request_state(params)
+    top_n = int(params["top_n"]) if "top_n" in params else None
+    sort = params.get("sort", "true").lower() != "false"
+    return _frame(tables.distribution(engine, selections, _dimension(path["dim"]), sort, top_n))
+
+
+def comparison(path, params):
+    engine, selections = _request_state(params)
+    return _frame(tables.comparison(
+        engine, selections, _dimension(path["dim"]), _dimension(path["compare"])
+    ))
+
+
+def crosstab(path, params):
+    engine, selections = _request_state(params)
+    show_as = params.get("show_as", "Count")
+    if show_as not in ("Count", "Row %", "Column %"):
+        raise BadRequest("show_as is one of Count, Row %, Column %")
+    pivot = tables.crosstab(engine, selections, _dimension(path["rows"]),
+                            _dimension(path["cols"]), show_as)
+    return _frame(pivot, "split")
+
+
+def cohort(path, params):
+    engine, selections = _request_state(params)
+    text = params.get("cohort")
+    if not text:
+        raise BadRequest('cohort is required, e.g. team_focus = "Fighting fires"')
+    selected = survey_cohort.parse(text)
+    cohorts = [selected.named("has"), (~selected).named("not")]
+    return _frame(tables.cohort_comparison(engine, selections, cohorts, _dimension(path["dim"])))
+
+
+def cohorts(path, params):
+    engine, selections = _request_state(params)
+    if "field" in params:
+        field = params["field"]
+        if field not in config.MULTI_SELECT:
+            raise BadRequest(f"field is one of {config.MULTI_SELECT}")
+        compared = survey_cohort.combinations(
+            field, config.MULTI_SELECT_OPTIONS[field], int(params.get("k", 2))
+        )
+    else:
+        compared = [survey_cohort.parse(text) for text in params.getlist("cohort")]
+    if not compared:
+        raise BadRequest("pass cohort (repeatable) or field (and k)")
+    return _frame(tables.cohort_comparison(engine, selections, compared, _dimension(path["dim"])))
+
+
+def frequent(path, params):
+    engine, selections = _request_state(params)
+    fields = params.getlist("field") or None
+    if fields and not set(fields).issubset(config.MULTI_SELECT):
+        raise BadRequest(f"field is one of {config.MULTI_SELECT}")
+    found = itemsets.mine(engine, selections, fields,
+                          float(params.get("min_support", 0.05)), int(params.get("max_size", 3)))
+    body = {"itemsets": json.loads(_frame(found))}
+    if "segment" in params:
+        top = found.head(int(params.get("top_n", 20)))
+        body["prevalence"] = json.loads(_frame(
+            itemsets.prevalence(engine, selections, top, _dimension(params["segment"]))
+        ))
+    return json.dumps(body, ensure_ascii=False)
+
+
+def yoy(path, params):
+    engine, selections = _request_state(params)
+    return _frame(tables.year_over_year(engine, selections, _dimension(path["dim"])), "split")
+
+
+# ============================================================
+# APP
+# ============================================================
+def _cache_key(handler, path, params):
+    """Response cache key: filters as a set, other parameters in request order.
+
+    Filter values and years are order-insensitive, but repeated `cohort`
+    or `field` values set the order of the result rows.
+    """
+    filters = set(config.FILTER_COLUMNS) | {"year"}
+    names = list(dict.fromkeys(params))
+    return (
+        handler.__name__,
+        tuple(sorted(path.items())),
+        selection_key({k: params.getlist(k) for k in names if k in filters}),
+        tuple((k, tuple(params.getlist(k))) for k in names if k not in filters),
+    )
+
+
+def _stale(years, delta_index):
+    """Predicate over response keys: does an append to `years` change the response?
+
+    Responses of other year sets are kept; of the rest, /values always
+    changes and the others when their filters match a new respondent.
+    """
+    matches = affected(delta_index) if delta_index is not None else None
+
+    def stale(key):
+        filters = dict(key[2])
+        requested = tuple(sorted(int(y) for y in filters.pop("year", ()))) or (config.CURRENT_YEAR,)
+        if requested != years:
+            return False
+        return matches is None or key[0] == "values" or matches(filters)
+
+    return stale
+
+
+def create_app(cache_size=RESPONSE_CACHE_SIZE):
+    """Starlette app serving the endpoints above."""
+    if Starlette is None:
+        raise ImportError("survey.api needs starlette: pip install starlette uvicorn")
+    responses = LRUCache(cache_size)
+    data.on_append(lambda years, delta_index: responses.discard(_stale(years, delta_index)))
+
+    def endpoint(handler):
+        async def respond(request):
+            path = dict(request.path_params)
+            key = _cache_key(handler, path, request.query_params)
+            try:
+                body = await run_in_threadpool(
+                    responses.get_or_compute, key, lambda: handler(path, request.query_params)
+                )
+            except ValueError as exc:  # BadRequest and unparsable numbers
+                return JSONResponse({"error": str(exc)}, status_code=400)
+            return Response(body, media_type="application/json")
+        return respond
+
+    async def health(request):
+        return JSONResponse({"status": "ok", "engine": config.ENGINE, "years": config.YEARS,
+                             "cached_responses": len(responses), "hits": responses.hits,
+                             "misses": responses.misses})
+
+    return Starlette(routes=[
+        Route("/health", health),
+        Route("/values/{col}", endpoint(values)),
+        Route("/size", endpoint(size)),
+        Route("/distribution/{dim}", endpoint(distribution)),
+        Route("/comparison/{dim}/{compare}", endpoint(comparison)),
+        Route("/crosstab/{rows}/{cols}", endpoint(crosstab)),
+        Route("/cohort/{dim}", endpoint(cohort)),
+        Route("/cohorts/{dim}", endpoint(cohorts)),
+        Route("/itemsets", endpoint(frequent)),
+        Route("/yoy/{dim}", endpoint(yoy)),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Explorer aggregates over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes; memory-mapped tables are shared between them")
+    args = parser.parse_args()
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("survey.api needs uvicorn to serve: pip install uvicorn")
+    uvicorn.run("survey.api:create_app", factory=True, host=args.host, port=args.port,
+                workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Bitmap index over respondents for fast filter resolution.
+
+For every (column, value) the index keeps a packed bitset with one bit per
+respondent row (np.packbits, 8 respondents per byte). A filter state such as
+the Explorer sidebar resolves with one OR per selected value and one AND per
+column, instead of re-running `isin` over the frame on every rerun:
+
+    index = BitmapIndex.from_model(model, ["role_clean", "region"])
+    bits = index.filter({"role_clean": ["Data Engineer"], "region": regions})
+    filtered = model.respondents[index.mask(bits)]
+
+Multi-select fields are indexed from their bridge tables, so a bit is set
+when the respondent selected that option.
+"""
+import numpy as np
+import pandas as pd
+
+from survey import config, store
+
+# Set bits per byte value, for popcounts over packed bitsets
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+def index_columns(model):
+    """The config.INDEX_COLUMNS that `model` holds."""
+    return [col for col in config.INDEX_COLUMNS
+            if col in model.respondents or model.is_multi(col)]
+
+
+def _joined(a, n, b, m):
+    """Packed bitset of `n` bits `a` followed by `m` bits `b`."""
+    shift = n % 8
+    if not shift:
+        return np.concatenate([a, b])
+    wide = np.append(b, 0).astype(np.uint16)
+    tail = ((wide[:-1] << (8 - shift)) | (wide[1:] >> shift)) & 0xFF
+    head = a.copy()
+    head[-1] |= wide[0] >> shift
+    return np.concatenate([head, tail.astype(np.uint8)])[:(n + m + 7) // 8]
+
+
+class BitmapIndex:
+    """Packed per-(column, value) respondent bitsets."""
+
+    def __init__(self, ids, bitmaps, complete):
+        self.ids = ids              # respondent id of each bit position
+        self.n = len(ids)
+        self.bitmaps = bitmaps      # {column: {value: packed uint8 array}}
+        self.complete = complete    # {column: every respondent has a value}
+
+    @classmethod
+    def from_model(cls, model, columns):
+        """Index `columns` of a SurveyModel (single-valued or multi-select)."""
+        ids = model.respondents["id"].to_numpy()
+        bitmaps, complete = {}, {}
+        for col in columns:
+            if model.is_multi(col):
+                bridge = model.bridges[col]
+                rows = pd.Index(ids).get_indexer(bridge["id"])
+                keep = rows >= 0
+                rows, values = rows[keep], bridge[col].to_numpy()[keep]
+            else:
+                rows, values = np.arange(len(ids)), model.respondents[col].to_numpy()
+            codes, uniques = pd.factorize(values, sort=True)
+            dense = np.zeros((len(uniques), len(ids)), dtype=bool)
+            has = codes >= 0
+            dense[codes[has], rows[has]] = True
+            packed = np.packbits(dense, axis=1)
+            bitmaps[col] = {value: packed[i] for i, value in enumerate(uniques)}
+            complete[col] = bool(dense.any(axis=0).all())
+        return cls(ids, bitmaps, complete)
+
+    def append(self, other):
+        """Index of these respondents followed by `other`'s, over this index's columns.
+
+        Bitsets are joined bytewise (shifting `other`'s into the free bits of
+        the last byte), so nothing is recounted from the model.
+        """
+        bitmaps = {}
+        for col, mine in self.bitmaps.items():
+            theirs = other.bitmaps[col]
+            bitmaps[col] = {
+                value: _joined(mine.get(value, self.none()), self.n,
+                               theirs.get(value, other.none()), other.n)
+                for value in store.ordered_values(col, set(mine).union(theirs))
+            }
+        complete = {col: self.complete[col] and other.complete[col] for col in self.bitmaps}
+        return BitmapIndex(np.concatenate([self.ids, other.ids]), bitmaps, complete)
+
+    def values(self, col):
+        """Indexed values of `col`, sorted (declared order for CATEGORY_ORDER columns)."""
+        return store.ordered_values(col, self.bitmaps[col])
+
+    def all(self):
+        """Bitset with every respondent set."""
+        return np.packbits(np.ones(self.n, dtype=bool))
+
+    def none(self):
+        return np.zeros((self.n + 7) // 8, dtype=np.uint8)
+
+    def select(self, col, values):
+        """OR of the bitsets of `values` in `col` (unknown values are ignored)."""
+        bits = self.none()
+        for value in values:
+            if value in self.bitmaps[col]:
+                bits |= self.bitmaps[col][value]
+        return bits
+
+    def is_restricted(self, col, values):
+        """False when selecting `values` in `col` matches every respondent."""
+        return not (self.complete[col] and set(values).issuperset(self.bitmaps[col]))
+
+    def filter(self, selections):
+        """AND over columns of each column's OR-ed selection.
+
+        Unrestricted columns (see is_restricted) are skipped.
+        """
+        bits = self.all()
+        for col, values in selections.items():
+            if self.is_restricted(col, values):
+                bits &= self.select(col, values)
+        return bits
+
+    def count(self, bits):
+        """Number of respondents in a bitset."""
+        return int(_POPCOUNT[bits].sum())
+
+    def cross_counts(self, rows, col):
+        """Respondents in each of `rows` (stacked bitsets) AND each value of `col`.
+
+        Returns a (len(rows), len(values(col))) array; one AND + popcount
+        per value over all rows at once.
+        """
+        rows = np.atleast_2d(rows)
+        counts = np.empty((len(rows), len(self.bitmaps[col])), dtype=np.int64)
+        for j, value in enumerate(self.values(col)):
+            counts[:, j] = _POPCOUNT[rows & self.bitmaps[col][value]].sum(axis=1)
+        return counts
+
+    def mask(self, bits):
+        """Boolean mask aligned with the respondent table rows."""
+        return np.unpackbits(bits, count=self.n).astype(bool)
+
+    def ids_of(self, bits):
+        """Respondent ids in a bitset."""
+        return self.ids[self.mask(bits)]
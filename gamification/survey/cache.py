@@ -0,0 +1,134 @@
+"""Process-wide LRU cache for Explorer aggregates.
+
+`CachedEngine` wraps a query engine (CubeEngine or DuckDBEngine) and
+memoizes every count keyed on (normalized filter state, method, dims), so a
+filter state that any session has already rendered — the default
+"everything selected" view in particular — is served without touching the
+engine. The cache is bounded and evicts least-recently-used entries; keep one
+instance per process (survey.data holds them) to share it across sessions.
+"""
+import threading
+from collections import OrderedDict
+
+from survey import config
+
+
+class LRUCache:
+    """Thread-safe mapping with a maximum size and LRU eviction."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        # Computed outside the lock; two sessions racing on the same key
+        # both compute it once, which is cheaper than serializing all work
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def discard(self, predicate):
+        """Drop every entry whose key satisfies `predicate`."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def selection_key(selections):
+    """Order-insensitive, hashable form of a sidebar filter state."""
+    return tuple(sorted(
+        (col, tuple(sorted(values, key=str))) for col, values in selections.items()
+    ))
+
+
+class CachedSource:
+    """An engine source (e.g. a cohort) paired with a stable cache key."""
+
+    def __init__(self, key, source):
+        self.key = key
+        self.source = source
+
+
+class CachedEngine:
+    """Engine wrapper memoizing aggregates in a shared LRUCache."""
+
+    def __init__(self, engine, maxsize=None):
+        self.engine = engine
+        self.cache = LRUCache(config.AGGREGATE_CACHE_SIZE if maxsize is None else maxsize)
+
+    def _key(self, source):
+        if isinstance(source, CachedSource):
+            return source.key
+        return selection_key(source)
+
+    def _inner(self, source):
+        return source.source if isinstance(source, CachedSource) else source
+
+    def _cached(self, method, source, *args):
+        key = (self._key(source), method) + tuple(
+            tuple(a) if isinstance(a, list) else a for a in args
+        )
+        return self.cache.get_or_compute(
+            key, lambda: getattr(self.engine, method)(self._inner(source), *args)
+        )
+
+    def values(self, col):
+        return self.cache.get_or_compute(("values", col), lambda: self.engine.values(col))
+
+    def total(self):
+        return self.cache.get_or_compute(("total",), self.engine.total)
+
+    def size(self, source):
+        return self._cached("size", source)
+
+    def count_where(self, source, col, values):
+        return self._cached("count_where", source, col, tuple(sorted(values, key=str)))
+
+    def counts(self, source, dim):
+        return self._cached("counts", source, dim)
+
+    def pair_counts(self, source, row_dim, col_dim):
+        return self._cached("pair_counts", source, row_dim, col_dim)
+
+    def cells(self, source, dims):
+        return self._cached("cells", source, list(dims))
+
+    def split(self, source, cohort):
+        """Cohorts of a source, keyed so their aggregates are cached too."""
+        key = (self._key(source), "split", str(cohort))
+        has, rest = self.cache.get_or_compute(
+            key, lambda: self.engine.split(self._inner(source), cohort)
+        )
+        return CachedSource(key + (True,), has), CachedSource(key + (False,), rest)
+
+    def sizes(self, source, cohorts):
+        key = (self._key(source), "sizes", tuple(str(c) for c in cohorts))
+        return self.cache.get_or_compute(
+            key, lambda: self.engine.sizes(self._inner(source), cohorts)
+        )
+
+    def compare(self, source, cohorts, dim):
+        key = (self._key(source), "compare", tuple((c.name, str(c)) for c in cohorts), dim)
+        return self.cache.get_or_compute(
+            key, lambda: self.engine.compare(self._inner(source), cohorts, dim)
+        )
@@ -0,0 +1,291 @@
+"""Cohorts: boolean expressions over respondent dimensions.
+
+A cohort is built from terms on any indexed column, single-valued or
+multi-select (where a term means "selected this option"), combined with
+and / or / not:
+
+    c = cohort.parse('modeling_pain_points = "Hard to maintain over time" '
+                     'and not region in ("Europe", "North America")')
+    c = Term("team_focus", ["Fighting fires"]) & ~Term("org_size", ["10,000+"])
+
+Engines compile a cohort to set operations: bitset AND / OR / NOT over the
+survey.bitmap.BitmapIndex (CubeEngine), or a SQL predicate with EXISTS over
+the bridge tables (DuckDBEngine). `combinations` enumerates every k-option
+cohort of a multi-select field, e.g. all pain-point pairs, for
+engine.compare().
+"""
+import dataclasses
+import itertools
+import re
+
+from survey import config
+
+
+class Cohort:
+    """Base of cohort expressions; combine with &, | and ~.
+
+    Cohorts are immutable (frozen dataclasses), so a parsed or cached one can
+    be shared and relabelled freely.
+    """
+
+    label = None
+
+    def __and__(self, other):
+        return And((self, other))
+
+    def __or__(self, other):
+        return Or((self, other))
+
+    def __invert__(self):
+        return Not(self)
+
+    def named(self, label):
+        """A copy of this cohort, displayed as `label`."""
+        return dataclasses.replace(self, label=label)
+
+    @property
+    def name(self):
+        return self.label or str(self)
+
+    def __repr__(self):
+        return f"<Cohort {self}>"
+
+
+@dataclasses.dataclass(frozen=True, repr=False)
+class Term(Cohort):
+    """Respondents whose `col` is (or, multi-select, includes) one of `values`."""
+
+    col: str
+    values: tuple
+    label: str = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "values", tuple(self.values))
+
+    def columns(self):
+        return {self.col}
+
+    def bits(self, index):
+        return index.select(self.col, self.values)
+
+    def sql(self, multi):
+        marks = ", ".join("?" * len(self.values))
+        if not self.values:
+            return "FALSE", []
+        if self.col in multi:
+            bridge = _quote(self.col)
+            return (f"EXISTS (SELECT 1 FROM {bridge} b WHERE b.id = r.id "
+                    f"AND b.{bridge} IN ({marks}))"), list(self.values)
+        return f"coalesce(r.{_quote(self.col)} IN ({marks}), FALSE)", list(self.values)
+
+    def __str__(self):
+        if len(self.values) == 1:
+            return f"{self.col} = {_literal(self.values[0])}"
+        return f"{self.col} in ({', '.join(_literal(v) for v in self.values)})"
+
+
+@dataclasses.dataclass(frozen=True, repr=False)
+class And(Cohort):
+    parts: tuple
+    label: str = None
+
+    def columns(self):
+        return set().union(*(p.columns() for p in self.parts))
+
+    def bits(self, index):
+        bits = index.all()
+        for part in self.parts:
+            bits &= part.bits(index)
+        return bits
+
+    def sql(self, multi):
+        return _join(" AND ", self.parts, multi)
+
+    def __str__(self):
+        return " and ".join(_grouped(p, Or) for p in self.parts)
+
+
+@dataclasses.dataclass(frozen=True, repr=False)
+class Or(Cohort):
+    parts: tuple
+    label: str = None
+
+    def columns(self):
+        return set().union(*(p.columns() for p in self.parts))
+
+    def bits(self, index):
+        bits = index.none()
+        for part in self.parts:
+            bits |= part.bits(index)
+        return bits
+
+    def sql(self, multi):
+        return _join(" OR ", self.parts, multi)
+
+    def __str__(self):
+        return " or ".join(str(p) for p in self.parts)
+
+
+@dataclasses.dataclass(frozen=True, repr=False)
+class Not(Cohort):
+    part: Cohort
+    label: str = None
+
+    def columns(self):
+        return self.part.columns()
+
+    def bits(self, index):
+        # all() keeps the padding bits of the last byte clear
+        return index.all() & ~self.part.bits(index)
+
+    def sql(self, multi):
+        where, params = self.part.sql(multi)
+        return f"NOT ({where})", params
+
+    def __str__(self):
+        return f"not {_grouped(self.part, (And, Or))}"
+
+
+def combinations(col, options, k):
+    """One cohort per k-combination of `options` of a multi-select `col`.
+
+    Each selected all k options; labelled "A + B (+ C)". Raises ValueError
+    unless 1 <= k <= len(options).
+    """
+    options = list(options)
+    if not 1 <= k <= len(options):
+        raise ValueError(f"k must be between 1 and {len(options)} (the number of options), got {k}")
+    return [
+        And(tuple(Term(col, [option]) for option in combo), " + ".join(combo))
+        for combo in itertools.combinations(options, k)
+    ]
+
+
+# ============================================================
+# PARSER
+# ============================================================
+_TOKEN = re.compile(r'\s*(?:(?P<string>"(?:[^"\\]|\\.)*")|(?P<op>!=|[=(),])|(?P<word>[^\s=!(),"]+))')
+_KEYWORDS = {"and", "or", "not", "in"}
+_EXPECTED = {"word": "a column name", "op": "= or !="}
+
+
+def parse(text, columns=None):
+    """Cohort from an expression such as `col = "v" and not col2 in ("a", "b")`.
+
+    Values are double-quoted strings, numbers or true/false; `!=` negates a
+    term. Columns must be in `columns` (default: config.DIMENSIONS and
+    config.FILTER_COLUMNS). Raises ValueError on a malformed expression.
+    """
+    columns = set(columns or config.DIMENSIONS + config.FILTER_COLUMNS)
+    tokens = _tokenize(text)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else (None, None)
+
+    def take(kind=None, value=None):
+        nonlocal pos
+        token = peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            expected = value or _EXPECTED.get(kind, "more input")
+            found = "end of expression" if token[0] is None else repr(token[1])
+            raise ValueError(f"expected {expected}, found {found}")
+        pos += 1
+        return token[1]
+
+    def either(parse_part, keyword, node):
+        parts = [parse_part()]
+        while peek() == ("word", keyword):
+            take()
+            parts.append(parse_part())
+        return parts[0] if len(parts) == 1 else node(tuple(parts))
+
+    def expression():
+        return either(conjunction, "or", Or)
+
+    def conjunction():
+        return either(negation, "and", And)
+
+    def negation():
+        if peek() == ("word", "not"):
+            take()
+            return Not(negation())
+        if peek() == ("op", "("):
+            take()
+            inner = expression()
+            take("op", ")")
+            return inner
+        return term()
+
+    def term():
+        col = take("word")
+        if col in _KEYWORDS or col not in columns:
+            raise ValueError(f"unknown column {col!r}")
+        if peek() == ("word", "in"):
+            take()
+            take("op", "(")
+            values = [value()]
+            while peek() == ("op", ","):
+                take()
+                values.append(value())
+            take("op", ")")
+            return Term(col, values)
+        op = take("op")
+        if op not in ("=", "!="):
+            raise ValueError(f"expected = or != after {col!r}, found {op!r}")
+        node = Term(col, [value()])
+        return node if op == "=" else Not(node)
+
+    def value():
+        kind, raw = peek()
+        if kind == "string":
+            take()
+            return re.sub(r"\\(.)", r"\1", raw[1:-1])
+        if kind != "word":
+            raise ValueError("expected a value, found "
+                             + ("end of expression" if kind is None else repr(raw)))
+        word = take()
+        if word.lower() in ("true", "false"):
+            return word.lower() == "true"
+        try:
+            return int(word)
+        except ValueError:
+            raise ValueError(f"unquoted value {word!r} (quote text values)") from None
+
+    result = expression()
+    if pos != len(tokens):
+        raise ValueError(f"unexpected {tokens[pos][1]!r}")
+    return result
+
+
+def _tokenize(text):
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match:
+            raise ValueError(f"cannot parse {text[pos:].strip()!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+def _literal(value):
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+def _grouped(part, kinds):
+    return f"({part})" if isinstance(part, kinds) else str(part)
+
+
+def _join(separator, parts, multi):
+    compiled = [part.sql(multi) for part in parts]
+    return (separator.join(f"({where})" for where, _ in compiled),
+            [param for _, params in compiled for param in params])
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
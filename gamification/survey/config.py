@@ -0,0 +1,109 @@
+"""Paths and constants shared by the pipeline and the Streamlit pages."""
+import os
+import re
+from pathlib import Path
+
+# Resolved from this file so the app works whether it is launched from the
+# repo root (devcontainer) or from gamification/ (README instructions).
+ROOT_DIR = Path(__file__).resolve().parents[2]
+DATA_DIR = ROOT_DIR / "data"
+BUILD_DIR = DATA_DIR / "build"
+
+# One raw survey per year: survey_<year>_data_engineering.csv. Each year is
+# built into its own partition (model_dir / build_dir); CURRENT_YEAR, the
+# latest raw survey, is the default partition wherever a single year is
+# meant (Game, pipeline CLI).
+RAW_SURVEYS = {
+    int(match.group(1)): path
+    for path in sorted(DATA_DIR.glob("survey_*_data_engineering.csv"))
+    if (match := re.fullmatch(r"survey_(\d{4})_data_engineering\.csv", path.name))
+}
+CURRENT_YEAR = max(RAW_SURVEYS, default=2026)
+# Years with a raw survey or an ingested partition (survey.ingest)
+YEARS = sorted(set(RAW_SURVEYS).union(
+    int(path.name.removeprefix("year=")) for path in (DATA_DIR / "model").glob("year=*")
+    if path.name.removeprefix("year=").isdigit()
+)) or [CURRENT_YEAR]
+RAW_SURVEY = RAW_SURVEYS.get(CURRENT_YEAR, DATA_DIR / f"survey_{CURRENT_YEAR}_data_engineering.csv")
+PLATFORM_MAPPING = DATA_DIR / "survey_platform_mapping.csv"
+ROLE_MAPPING = DATA_DIR / "survey_role_mapping.csv"
+BOTTLENECK_MAPPING = DATA_DIR / "survey_bottleneck_mapping.csv"
+ORCHESTRATION_MAPPING = DATA_DIR / "survey_orchestration_mapping.csv"
+MODELING_MAPPING = DATA_DIR / "survey_modeling_mapping.csv"
+
+# Per year, under MODEL_DIR/year=<year>/: the star schema (respondents.parquet
+# plus one bridge table per multi-select field), expanded.parquet, the cube
+# and the compiled question banks
+MODEL_DIR = DATA_DIR / "model"
+
+
+def model_dir(year=None):
+    """Partition holding one survey year's pipeline outputs."""
+    return MODEL_DIR / f"year={year or CURRENT_YEAR}"
+
+
+def build_dir(year=None):
+    """Stage caches and manifest of one survey year's build."""
+    return BUILD_DIR / f"year={year or CURRENT_YEAR}"
+
+
+# Explorer query engine: "pandas" (in-process model + cube) or "duckdb"
+ENGINE = os.environ.get("SURVEY_ENGINE", "pandas")
+# Entries kept by the process-wide Explorer aggregate cache (survey.cache)
+AGGREGATE_CACHE_SIZE = int(os.environ.get("SURVEY_CACHE_SIZE", "512"))
+# Read respondent and bridge tables from their memory-mapped copies when
+# present (SURVEY_MMAP=0 reads the Parquet files instead)
+MMAP = os.environ.get("SURVEY_MMAP", "1") != "0"
+# Explorer computes only the selected tab (SURVEY_LAZY_TABS=0 renders all)
+LAZY_TABS = os.environ.get("SURVEY_LAZY_TABS", "1") != "0"
+
+# Multi-select survey fields, exploded into one row per selected option.
+# Answers are stored comma-joined, but some options contain commas themselves
+# ("Writing Code (SQL, Python, etc)"), so they are matched against this list.
+MULTI_SELECT_OPTIONS = {
+    "team_focus": [
+        "Data modeling / transformation", "Ingestion / pipelines",
+        "Data quality / reliability", "Analytics / BI", "Fighting fires",
+        "Infrastructure / platform work", "ML / AI",
+    ],
+    "modeling_pain_points": [
+        "Pressure to “move fast”", "Lack of clear ownership",
+        "Hard to maintain over time", "Tools don’t support good modeling",
+        "None / modeling is going well", "AI tools produce inconsistent schemas",
+    ],
+    "ai_helps_with": [
+        "Writing Code (SQL, Python, etc)", "Documentation / data discovery",
+        "Pipeline debugging", "Architecture design", "Data modeling",
+        "Governance / quality checks", "I don't find AI helpful",
+    ],
+}
+MULTI_SELECT = list(MULTI_SELECT_OPTIONS)
+
+# Ordinal answers, in display order. Stored as ordered categoricals (values
+# outside the list follow, sorted), so counts, sidebar options and charts
+# come out in this order without re-sorting.
+CATEGORY_ORDER = {
+    "org_size": ["< 50 employees", "50–199", "200–999", "1,000–10,000", "10,000+"],
+    "ai_usage_frequency": ["Multiple times per day", "Daily", "Weekly", "Rarely", "Never"],
+    "team_growth_2026": ["Grow", "Stay the same", "Shrink", "Not sure"],
+}
+
+# Explorer sidebar filters (single-valued respondent columns)
+FILTER_COLUMNS = [
+    "role_clean", "org_size", "industry", "region",
+    "ai_usage_frequency", "management_vs_non",
+]
+
+# Dimensions offered by the Crosstab tab and pre-aggregated in the cube
+DIMENSIONS = [
+    "role_clean", "org_size", "industry", "region",
+    "ai_usage_frequency", "ai_adoption", "team_focus",
+    "modeling_clean", "modeling_pain_points", "ai_helps_with",
+    "architecture_clean", "bottleneck_clean", "orchestration_clean",
+    "team_growth_2026", "education_clean", "management_vs_non",
+    "Category", "fights_fires", "survey_year",
+]
+
+# Columns with a bitmap index (survey.bitmap): the sidebar filters plus every
+# dimension, so cohorts (survey.cohort) can be defined on any of them
+INDEX_COLUMNS = list(dict.fromkeys(FILTER_COLUMNS + DIMENSIONS))
@@ -0,0 +1,333 @@
+"""Pre-aggregated respondent counts (OLAP cube) for the Explorer.
+
+The pipeline stores, over all respondents:
+
+    {a}          1-D marginal of every dimension
+    {a, b}       every pair of dimensions (Crosstab, comparison chart)
+    {a, b, f}    every pair split by one sidebar filter column f
+
+Each respondent has exactly one value of a filter column, so counts under a
+selection that restricts a single filter column are the sum of the matching
+f-slices. The unfiltered view and every one-filter view are therefore served
+by lookup; other selections fall back to live aggregation on the model.
+"""
+import functools
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from survey import aggregate, config, store
+
+
+def cells(dims=None, filters=None):
+    """Dimension lists of every cube cell, in build order."""
+    dims = dims or config.DIMENSIONS
+    filters = filters or config.FILTER_COLUMNS
+    keys = {}
+    for a in dims:
+        keys[frozenset([a])] = [a]
+    for a, b in itertools.combinations(dims, 2):
+        keys[frozenset([a, b])] = [a, b]
+        for f in filters:
+            if f not in (a, b):
+                keys[frozenset([a, b, f])] = [a, b, f]
+    # Marginal × filter pairs for filters outside `dims`
+    for a, f in itertools.product(dims, filters):
+        if a != f:
+            keys.setdefault(frozenset([a, f]), [a, f])
+    return list(keys.values())
+
+
+def build_cube(model, dims=None, filters=None):
+    """{frozenset(dims): counts Series} over all respondents."""
+    everyone = model.respondents
+    return {frozenset(cell): model.cell_counts(everyone, cell) for cell in cells(dims, filters)}
+
+
+class CubeEngine:
+    """Counts for a sidebar selection, from the cube when possible.
+
+    A `source` is either a dict of sidebar selections ({column: values}) or
+    a frame of respondent rows (a cohort from split()), which is always
+    aggregated live.
+    """
+
+    def __init__(self, model, index, cube):
+        self.model = model
+        self.index = index
+        self.cube = cube
+
+    def respondents(self, selections):
+        """Respondent rows matching a selection."""
+        return self.model.respondents[self.index.mask(self.index.filter(selections))]
+
+    def values(self, col):
+        """Sorted values of a filter column, for the sidebar."""
+        return self.index.values(col)
+
+    def total(self):
+        return len(self.model.respondents)
+
+    def size(self, source):
+        """Number of respondents in a source."""
+        if isinstance(source, dict):
+            return self.index.count(self.index.filter(source))
+        return len(source)
+
+    def count_where(self, source, col, values):
+        """Respondents in a source whose (single-valued) `col` is one of `values`."""
+        counts = self.counts(source, col)
+        return int(counts[counts.index.isin(values)].sum())
+
+    def split(self, source, cohort):
+        """(rows in `cohort`, all other rows) of a selection; see survey.cohort."""
+        bits = self.index.filter(source)
+        has = bits & cohort.bits(self.index)
+        rows = self.model.respondents
+        return rows[self.index.mask(has)], rows[self.index.mask(bits & ~has)]
+
+    def sizes(self, source, cohorts):
+        """Respondents of a selection in each of `cohorts` (array, in order)."""
+        bits = self.index.filter(source)
+        return np.array([self.index.count(bits & c.bits(self.index)) for c in cohorts],
+                        dtype=np.int64)
+
+    def compare(self, source, cohorts, dim):
+        """Respondents per value of `dim` in each cohort of a selection.
+
+        One row per cohort (by name): its size under `respondents`, then a
+        count per value of `dim`, from one bitset pass over all cohorts.
+        """
+        bits = self.index.filter(source)
+        rows = np.stack([bits & c.bits(self.index) for c in cohorts])
+        frame = pd.DataFrame(self.index.cross_counts(rows, dim),
+                             index=[c.name for c in cohorts], columns=self.index.values(dim))
+        frame.insert(0, "respondents", [self.index.count(r) for r in rows])
+        return frame
+
+    def counts(self, source, dim):
+        """Respondents per value of `dim` (same result as SurveyModel.counts)."""
+        return self.cells(source, [dim])
+
+    def pair_counts(self, source, row_dim, col_dim):
+        """Respondents per (row_dim, col_dim) pair (same as SurveyModel.pair_counts)."""
+        return self.cells(source, [row_dim, col_dim])
+
+    def cells(self, source, dims):
+        if isinstance(source, dict):
+            cached = self.lookup(source, dims)
+            if cached is not None:
+                return cached
+            source = self.respondents(source)
+        return self.model.cell_counts(source, dims)
+
+    def lookup(self, selections, dims):
+        """Counts for `dims` under `selections` from the cube, or None."""
+        if len(set(dims)) != len(dims):
+            return None
+        restricted = [col for col, values in selections.items()
+                      if self.index.is_restricted(col, values)]
+        if not restricted:
+            return self._slice(dims)
+        if len(restricted) > 1:
+            return None
+
+        f = restricted[0]
+        values = set(selections[f])
+        if f in dims:
+            counts = self._slice(dims)
+            if counts is None:
+                return None
+            return counts[counts.index.get_level_values(f).isin(values)]
+        counts = self._slice(dims + [f])
+        if counts is None:
+            return None
+        counts = counts[counts.index.get_level_values(f).isin(values)]
+        return counts.groupby(level=dims).sum()
+
+    def _slice(self, dims):
+        """Stored counts for `dims` with levels in the requested order."""
+        counts = self.cube.get(frozenset(dims))
+        if counts is None or len(dims) == 1:
+            return counts
+        if list(counts.index.names) != list(dims):
+            counts = counts.reorder_levels(dims).sort_index()
+        return counts
+
+
+def merge_cubes(a, b):
+    """Cube over the union of two disjoint respondent sets.
+
+    Every count is a number of distinct respondents, so when no respondent
+    is in both sets the cells simply add. Values keep their declared order
+    (see _added).
+    """
+    merged = dict(a)
+    for key, counts in b.items():
+        merged[key] = _added(merged[key], counts) if key in merged else counts
+    return merged
+
+
+def add_respondents(cube, model, dims=None, filters=None):
+    """Cube with the respondents of `model`, none of them counted yet, added.
+
+    The new respondents' cells are counted directly from their rows and
+    bridge entries (no per-cell aggregation over a frame), then added into
+    the stored Series by position, so the cost grows with the number of new
+    respondents rather than with the size of the cube. `cube` is not
+    modified; cells are only re-indexed when a new value appears.
+    """
+    rows, mappings = {}, {}
+    out = dict(cube)
+    for cell in cells(dims, filters):
+        key = frozenset(cell)
+        stored = cube.get(key)
+        if stored is not None:
+            cell = list(stored.index.names)
+        for dim in cell:
+            if dim not in rows:
+                rows[dim] = _value_rows(model, dim)
+        parts = [rows[dim] for dim in cell]
+        codes, counts = _cell_codes(parts)
+        if stored is not None and not len(counts):
+            continue  # no new respondent in this cell
+        labels = [part_labels for _, _, part_labels in parts]
+        added = None if stored is None else _add_codes(stored, codes, counts, labels, mappings)
+        if added is None:
+            added = _series(codes, counts, labels, cell)
+            added = added if stored is None else _added(stored, added)
+        out[key] = added
+    return out
+
+
+def _value_rows(model, dim):
+    """(respondent row, value code) pairs of `dim` sorted by row, and the value labels."""
+    if model.is_multi(dim):
+        bridge = model.bridges[dim]
+        rows = pd.Index(model.respondents["id"]).get_indexer(bridge["id"])
+        codes, labels = aggregate.factorize(bridge[dim])
+    else:
+        rows = np.arange(len(model.respondents))
+        codes, labels = aggregate.factorize(model.respondents[dim])
+    keep = (rows >= 0) & (codes >= 0)
+    order = np.argsort(rows[keep], kind="stable")
+    return rows[keep][order], codes[keep][order], labels
+
+
+def _cell_codes(parts):
+    """(value codes per dim of each combination, respondents per combination).
+
+    Rows are joined on the respondent like SurveyModel.frame; every joined
+    row is a distinct (respondent, values) combination, so counting rows
+    counts respondents. Combinations come out in code order.
+    """
+    rows, codes, _ = parts[0]
+    codes = [codes]
+    for part_rows, part_codes, _ in parts[1:]:
+        per_row = np.bincount(part_rows, minlength=len(rows) and rows.max() + 1)
+        matches = per_row[rows]
+        start = (np.cumsum(per_row) - per_row)[rows]
+        if len(per_row) and per_row.max() <= 1:
+            # At most one value per respondent: a plain filter
+            take = np.flatnonzero(matches)
+            picked = start[take]
+        else:
+            take = np.repeat(np.arange(len(rows)), matches)
+            within = np.arange(len(take)) - np.repeat(np.cumsum(matches) - matches, matches)
+            picked = start[take] + within
+        rows = rows[take]
+        codes = [c[take] for c in codes] + [part_codes[picked]]
+
+    sizes = [len(labels) for _, _, labels in parts]
+    cells, counts = np.unique(_packed(codes, sizes), return_counts=True)
+    return list(np.unravel_index(cells, sizes)), counts.astype(np.int64)
+
+
+def _packed(codes, sizes):
+    packed = np.zeros(len(codes[0]), dtype=np.int64)
+    for c, size in zip(codes, sizes):
+        packed = packed * size + c
+    return packed
+
+
+def _series(codes, counts, labels, names):
+    """Counts Series shaped as SurveyModel.cell_counts returns it."""
+    if len(names) == 1:
+        index = labels[0][codes[0]].rename(names[0])
+    else:
+        index = pd.MultiIndex(levels=labels, codes=codes, names=names, verify_integrity=False)
+    return pd.Series(counts, index=index, name="id")
+
+
+def _add_codes(stored, codes, counts, labels, mappings):
+    """`stored` with `counts` added by position, or None if a cell is not stored yet.
+
+    Cells of one dimension usually share their level values, so the label
+    to level-code mapping is kept in `mappings` for the rest of the call.
+    """
+    index = stored.index
+    multi = isinstance(index, pd.MultiIndex)
+    levels = index.levels if multi else [index]
+    mapped = []
+    for level, values, c in zip(levels, labels, codes):
+        key = (id(values), tuple(level))
+        if key not in mappings:
+            mappings[key] = level.get_indexer(values)
+        mapped.append(mappings[key][c])
+    if any((m < 0).any() for m in mapped):
+        return None
+    if multi:
+        sizes = [len(level) for level in levels]
+        stored_cells = _packed(index.codes, sizes)
+        order = np.argsort(stored_cells, kind="stable")
+        found = np.searchsorted(stored_cells, _packed(mapped, sizes), sorter=order)
+        positions = order[np.minimum(found, len(order) - 1)]
+        if (stored_cells[positions] != _packed(mapped, sizes)).any():
+            return None
+    else:
+        positions = mapped[0]
+    values = stored.to_numpy().copy()
+    values[positions] += counts
+    return pd.Series(values, index=index, name=stored.name)
+
+
+def _added(left, right):
+    """left + right, counts over disjoint respondents, in declared value order.
+
+    Levels are merged in store.ordered_values order and cells are sorted by
+    their codes in the merged levels, so ordinal dimensions keep their
+    config.CATEGORY_ORDER order and the others stay sorted.
+    """
+    names = list(left.index.names)
+    if list(right.index.names) != names:
+        right = right.reorder_levels(names)
+    left_levels, left_codes = _levels(left.index)
+    right_levels, right_codes = _levels(right.index)
+    levels, codes = [], []
+    for name, a, a_codes, b, b_codes in zip(names, left_levels, left_codes,
+                                            right_levels, right_codes):
+        level = a if a.equals(b) else pd.Index(store.ordered_values(name, set(a).union(b)))
+        levels.append(level)
+        codes.append(np.concatenate([level.get_indexer(a)[a_codes], level.get_indexer(b)[b_codes]]))
+    sizes = [len(level) for level in levels]
+    cells, inverse = np.unique(_packed(codes, sizes), return_inverse=True)
+    values = np.bincount(inverse, np.concatenate([left.to_numpy(), right.to_numpy()]))
+    return _series(list(np.unravel_index(cells, sizes)), values.astype(left.dtype), levels, names
+                   ).rename(left.name)
+
+
+def _levels(index):
+    """(levels, codes) of a MultiIndex, or of a flat index as one level."""
+    if isinstance(index, pd.MultiIndex):
+        return list(index.levels), list(index.codes)
+    return [index], [np.arange(len(index))]
+
+
+def load_cube(years=None):
+    """Stored cubes of `years` (default: the current survey year), merged.
+
+    Years hold disjoint respondents, so their cubes add like batches do.
+    """
+    return functools.reduce(merge_cubes, [store.load_cube(year)
+                                          for year in years or [config.CURRENT_YEAR]])
@@ -0,0 +1,148 @@
+"""Process-wide survey data shared by the Game and Explorer pages.
+
+Page scripts rerun on every interaction, but this module is imported once
+per server process, so everything here is loaded once and then shared by
+both pages and every session:
+
+    survey(years)     LiveSurvey: respondent table + bridges, bitmap index,
+                      cube, cached pandas engine and Game rate tables
+    engine(years)     the Explorer's engine (pandas or SURVEY_ENGINE=duckdb),
+                      with one aggregate cache per year set
+    banks()           compiled Game question banks (never loads the survey)
+    hl_bank()         Higher/Lower questions over banks()
+    append(raw)       new responses, added to everything above
+
+Loaders run the pipeline for the years they read first, as the pages did.
+Returned objects are shared: treat their frames as read-only and add
+respondents with append(), which keeps every resource current: each loaded
+survey of the current year takes the rows (LiveSurvey.append; surveys
+loaded later replay them), DuckDB engines, which read the stored partitions,
+give way to those surveys' engines, and the question banks are recompiled
+from the served survey on next use. Callbacks registered with on_append()
+(survey.api's response cache) hear about every change.
+"""
+import threading
+
+from survey import config, pipeline, questions
+from survey.cache import CachedEngine
+from survey.duckdb_engine import DuckDBEngine
+from survey.live import LiveSurvey
+
+# Respondent columns read by the pages; the Parquet loader skips the rest.
+# Multi-select fields (team_focus, modeling_pain_points, ai_helps_with) come
+# from their bridge tables rather than an exploded frame.
+MODEL_COLUMNS = [
+    "id", "role_clean", "org_size", "industry", "region", "ai_usage_frequency",
+    "management_vs_non", "bottleneck_clean", "team_growth_2026", "fights_fires",
+    "Category", "architecture_clean", "orchestration_clean", "ai_adoption",
+    "ai_helps_with", "modeling_clean", "modeling_pain_points", "education_clean",
+    "team_focus", "survey_year",
+]
+
+# Reentrant: hl_bank() loads banks() while holding it
+_lock = threading.RLock()
+_resources = {}
+_appended = []    # raw frames passed to append(), replayed into surveys loaded later
+_listeners = []   # on_append() callbacks
+
+
+def _shared(key, load):
+    """Load a resource once per process; concurrent first calls wait for it."""
+    with _lock:
+        if key not in _resources:
+            _resources[key] = load()
+        return _resources[key]
+
+
+def _years(years):
+    return tuple(sorted(years or [config.CURRENT_YEAR]))
+
+
+def survey(years=None):
+    """The pandas-side survey of `years` (default: the current year)."""
+    years = _years(years)
+
+    def load():
+        live = LiveSurvey.load(MODEL_COLUMNS, years=years)
+        if config.CURRENT_YEAR in years:
+            for raw in _appended:
+                live.append(raw)
+        live.on_append(lambda delta_index: _notify(years, delta_index))
+        return live
+    return _shared(("survey", years), load)
+
+
+def engine(years=None):
+    """Aggregate engine for the Explorer, memoized per filter state.
+
+    Once rows are appended, year sets holding the current year are served
+    by the survey's pandas engine whatever SURVEY_ENGINE says.
+    """
+    years = _years(years)
+    if config.ENGINE == "duckdb" and not _is_appended(years):
+        def load():
+            pipeline.build_years(years)
+            return CachedEngine(DuckDBEngine.connect(years=years))
+        return _shared(("duckdb", years), load)
+    return survey(years).engine
+
+
+def banks():
+    """Compiled question banks of the current year (see questions.load_banks).
+
+    After append(), compiled from the served survey instead.
+    """
+    def load():
+        if _is_appended((config.CURRENT_YEAR,)):
+            return questions.compile_banks(survey().model, None)
+        return questions.load_banks()
+    return _shared("banks", load)
+
+
+def hl_bank():
+    def load():
+        if _is_appended((config.CURRENT_YEAR,)):
+            return survey().hl_bank()
+        return questions.HLBank(banks()["hl"])
+    return _shared("hl_bank", load)
+
+
+# ============================================================
+# APPENDS
+# ============================================================
+def append(raw):
+    """Add raw survey rows (raw CSV columns) as current-year respondents.
+
+    Every loaded survey of the current year takes them, and so does any
+    loaded later; returns the new ids in the current year's own survey.
+    """
+    with _lock:
+        _appended.append(raw)
+        for key in [key for key in _resources if key[0] == "duckdb" and _is_appended(key[1])]:
+            del _resources[key]
+            _notify(key[1], None)
+        for key, live in list(_resources.items()):
+            if key[0] == "survey" and _is_appended(key[1]):
+                live.append(raw)
+        return survey().model.respondents["id"].to_numpy()[-len(raw):]
+
+
+def on_append(callback):
+    """Call `callback(years, delta_index)` when the data of `years` changes.
+
+    `delta_index` indexes the new respondents (see live.affected), or is
+    None when anything of those years may have changed.
+    """
+    _listeners.append(callback)
+
+
+def _is_appended(years):
+    return bool(_appended) and config.CURRENT_YEAR in years
+
+
+def _notify(years, delta_index):
+    if config.CURRENT_YEAR in years:
+        _resources.pop("banks", None)
+        _resources.pop("hl_bank", None)
+    for callback in _listeners:
+        callback(years, delta_index)
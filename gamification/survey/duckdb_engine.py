@@ -0,0 +1,222 @@
+"""DuckDB query engine for the Explorer (optional, `pip install duckdb`).
+
+Select it with SURVEY_ENGINE=duckdb. The respondents and bridge tables are
+views over the star-schema Parquet of every year partition
+(data/model/year=*/, read with hive_partitioning), restricted to the
+selected survey years, so nothing is copied, a year filter only opens that
+year's files, and the views always read the current pipeline output. Every
+Explorer aggregate runs as SQL:
+
+    SELECT "role_clean", COUNT(DISTINCT r.id) FROM respondents r
+    JOIN "team_focus" b0 ON b0.id = r.id WHERE ... GROUP BY ALL
+
+so nothing larger than a result set is held in pandas. The interface
+matches survey.cube.CubeEngine; sources are sidebar selection dicts or the
+Query objects returned by split(), and cohorts (survey.cohort) compile to
+SQL predicates.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from survey import config, store
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+
+# Cohorts per query in sizes() / compare()
+COHORT_BATCH = 64
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class Query:
+    """A respondent subset: SQL predicate over `respondents r` plus parameters."""
+
+    def __init__(self, where="TRUE", params=()):
+        self.where = where
+        self.params = list(params)
+
+    @classmethod
+    def from_selections(cls, selections):
+        """col IN (...) per sidebar filter, AND-ed (an empty selection matches nobody)."""
+        clauses, params = [], []
+        for col, values in selections.items():
+            values = list(values)
+            if not values:
+                clauses.append("FALSE")
+                continue
+            clauses.append(f"r.{_quote(col)} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        return cls(" AND ".join(clauses) or "TRUE", params)
+
+    def and_(self, where, params=()):
+        return Query(f"({self.where}) AND ({where})", self.params + list(params))
+
+
+class DuckDBEngine:
+    """Explorer aggregates as SQL over a local DuckDB database."""
+
+    def __init__(self, con):
+        self.con = con
+        self._lock = threading.Lock()
+        self.multi = set(config.MULTI_SELECT)
+
+    @classmethod
+    def connect(cls, path=None, years=None):
+        """Database (in memory unless `path` is given) with views over `years`' partitions."""
+        if duckdb is None:
+            raise ImportError("SURVEY_ENGINE=duckdb needs the duckdb package: pip install duckdb")
+        con = duckdb.connect(str(path) if path else ":memory:")
+        create_views(con, years)
+        return cls(con)
+
+    # ------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------
+    def _fetch(self, sql, params=()):
+        # One cursor per query: cursors are safe to use from Streamlit's
+        # session threads, the shared connection is not
+        with self._lock:
+            cursor = self.con.cursor()
+        try:
+            return cursor.execute(sql, list(params)).df()
+        finally:
+            cursor.close()
+
+    def _source(self, source):
+        return Query.from_selections(source) if isinstance(source, dict) else source
+
+    def values(self, col):
+        return store.ordered_values(col, self._fetch(
+            f"SELECT DISTINCT {_quote(col)} AS v FROM respondents WHERE v IS NOT NULL"
+        )["v"].tolist())
+
+    def total(self):
+        return int(self._fetch("SELECT COUNT(*) AS n FROM respondents")["n"][0])
+
+    def size(self, source):
+        query = self._source(source)
+        return int(self._fetch(
+            f"SELECT COUNT(*) AS n FROM respondents r WHERE {query.where}", query.params
+        )["n"][0])
+
+    def count_where(self, source, col, values):
+        values = list(values)
+        if not values:
+            return 0
+        query = self._source(source).and_(
+            f"r.{_quote(col)} IN ({', '.join('?' * len(values))})", values
+        )
+        return self.size(query)
+
+    def split(self, source, cohort):
+        query = self._source(source)
+        where, params = cohort.sql(self.multi)
+        return query.and_(where, params), query.and_(f"NOT ({where})", params)
+
+    def _per_cohort(self, select, tail, query, cohorts, count):
+        """Frames of one `count` FILTER column per cohort (k0, k1, ...).
+
+        Each cohort compiles to correlated subqueries and DuckDB caps the
+        expression depth of a query, so cohorts go COHORT_BATCH at a time.
+        """
+        frames = []
+        for start in range(0, len(cohorts), COHORT_BATCH):
+            compiled = [cohort.sql(self.multi) for cohort in cohorts[start:start + COHORT_BATCH]]
+            frames.append(self._fetch(
+                select + ", ".join(f"{count} FILTER (WHERE {where}) AS k{start + i}"
+                                   for i, (where, _) in enumerate(compiled)) + tail,
+                [param for _, ps in compiled for param in ps] + query.params,
+            ))
+        return frames
+
+    def sizes(self, source, cohorts):
+        """Respondents in each cohort of a source: one COUNT(*) FILTER column each."""
+        query = self._source(source)
+        frames = self._per_cohort("SELECT ", f" FROM respondents r WHERE {query.where}",
+                                  query, cohorts, "COUNT(*)")
+        if not frames:
+            return np.zeros(0, dtype=np.int64)
+        return pd.concat(frames, axis=1).iloc[0].to_numpy().astype("int64")
+
+    def compare(self, source, cohorts, dim):
+        """Counts of `dim` per cohort, one FILTER column each, after the cohort sizes."""
+        query = self._source(source)
+        if dim in self.multi:
+            join, column = f"JOIN {_quote(dim)} d ON d.id = r.id", f"d.{_quote(dim)}"
+        else:
+            join, column = "", f"r.{_quote(dim)}"
+        frames = self._per_cohort(
+            f"SELECT {column} AS v, ",
+            f" FROM respondents r {join} WHERE ({query.where}) AND {column} IS NOT NULL GROUP BY ALL",
+            query, cohorts, "COUNT(DISTINCT r.id)",
+        )
+        counts = pd.concat([f.set_index("v") for f in frames], axis=1).fillna(0).T
+        counts = counts[store.ordered_values(dim, counts.columns)].astype("int64")
+        counts.index = [cohort.name for cohort in cohorts]
+        counts.columns.name = None
+        counts.insert(0, "respondents", self.sizes(query, cohorts))
+        return counts
+
+    def counts(self, source, dim):
+        return self.cells(source, [dim])
+
+    def pair_counts(self, source, row_dim, col_dim):
+        return self.cells(source, [row_dim, col_dim])
+
+    def cells(self, source, dims):
+        """COUNT(DISTINCT id) per combination of `dims`, joining only the needed bridges."""
+        query = self._source(source)
+        names = list(dict.fromkeys(dims))
+        joins, columns = [], {}
+        for i, dim in enumerate(names):
+            if dim in self.multi:
+                alias = f"b{i}"
+                joins.append(f"JOIN {_quote(dim)} {alias} ON {alias}.id = r.id")
+                columns[dim] = f"{alias}.{_quote(dim)}"
+            else:
+                columns[dim] = f"r.{_quote(dim)}"
+        select = ", ".join(f"{columns[d]} AS c{i}" for i, d in enumerate(dims))
+        not_null = " AND ".join(f"{columns[d]} IS NOT NULL" for d in names)
+        keys = ", ".join(f"c{i}" for i in range(len(dims)))
+        result = self._fetch(
+            f"SELECT {select}, COUNT(DISTINCT r.id) AS n FROM respondents r {' '.join(joins)} "
+            f"WHERE ({query.where}) AND {not_null} GROUP BY ALL ORDER BY {keys}",
+            query.params,
+        )
+        result.columns = list(dims) + ["id"]
+        if len(dims) == 1:
+            return result.set_index(dims[0])["id"]
+        return result.set_index(list(dims))["id"]
+
+
+def create_views(con, years=None):
+    """(Re)create the respondents and bridge views over the year partitions.
+
+    Each reads every year=<y> partition of its table with hive_partitioning
+    and keeps `years`, so DuckDB prunes the other partitions' files; ids are
+    shifted by store.id_offsets, as in survey.model.load_model.
+    """
+    years = sorted(years or [config.CURRENT_YEAR])
+    offsets = store.id_offsets(years)
+    shift = " ".join(f"WHEN {year} THEN {offsets[year]}" for year in years)
+
+    def view(name, filename):
+        pattern = str(config.MODEL_DIR / "year=*" / filename).replace("'", "''")
+        con.execute(
+            f"CREATE OR REPLACE VIEW {name} AS "
+            f"SELECT * EXCLUDE (year) REPLACE (id + CASE year {shift} END AS id) "
+            f"FROM read_parquet('{pattern}', hive_partitioning = true, union_by_name = true) "
+            f"WHERE year IN ({', '.join(map(str, years))})"
+        )
+
+    view("respondents", store.respondents_path().name)
+    for field in config.MULTI_SELECT:
+        view(_quote(field), store.bridge_path(field).name)
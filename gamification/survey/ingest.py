@@ -0,0 +1,151 @@
+"""Chunked ingestion of large raw survey files.
+
+    python -m survey.ingest data/synthetic/survey_1000000.csv --year 2030   # from gamification/
+    python -m survey.ingest archive.csv --chunk-size 50000
+
+pipeline.build() holds the whole raw survey and its explosion in memory,
+which is fine for the real 1,101 respondents. This path streams a CSV of the
+same shape through the same stages, one batch of respondents at a time, into
+the survey year's partition (config.model_dir), the layout pipeline.build()
+writes and every loader, engine and page reads:
+
+    read_batches    raw rows with their global positional id
+    normalize       pipeline.normalize
+    stage           respondents and bridges, one Parquet part per batch under
+                    data/build/year=<year>/ingest/; the exploded rows are
+                    appended to expanded.parquet a row group per batch
+    aggregate       each batch's cells added into the running cube
+                    (cube.add_respondents, proportional to the batch)
+    finish          the memory-mapped tables, one column at a time from the
+                    parts, then respondents.parquet and the bridges from
+                    them; the cube, the Game question banks and the manifest
+
+Peak memory is one batch (or one column) plus the cube, whatever the file
+size. The manifest records the source file, so pipeline.build() keeps the
+partition while the source and the rules are unchanged, and ingests it
+again when they change.
+"""
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from survey import config, cube, model, pipeline, questions, store
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def read_batches(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Raw survey rows in batches, with the id load_raw() would give them.
+
+    Every raw column is text; reading them as such keeps a batch whose
+    answers are all missing from coming out numeric.
+    """
+    start = 0
+    for batch in pd.read_csv(path, chunksize=chunk_size, dtype=str):
+        batch.insert(0, "id", np.arange(start, start + len(batch)))
+        start += len(batch)
+        yield batch
+
+
+def normalized(batches, year=None):
+    for batch in batches:
+        yield pipeline.normalize(batch, year)
+
+
+def ingest(path, year=None, chunk_size=DEFAULT_CHUNK_SIZE, explode=True):
+    """Normalize, split, explode and aggregate `path` batch by batch.
+
+    The rows become survey `year` (default: the current one) and replace
+    that year's partition. Returns the manifest, also written to
+    data/build/year=<year>/manifest.json as pipeline.build() writes it.
+    """
+    path = Path(path)
+    year = year or config.CURRENT_YEAR
+    staging = config.build_dir(year) / "ingest"
+    shutil.rmtree(staging, ignore_errors=True)
+    config.model_dir(year).mkdir(parents=True, exist_ok=True)
+    store.expanded_path(year).unlink(missing_ok=True)
+    expanded = store.ParquetBatches(store.expanded_path(year))
+
+    counts, parts = {}, 0
+    respondents = rows = 0
+    bridge_rows = dict.fromkeys(config.MULTI_SELECT, 0)
+    try:
+        for part, batch in enumerate(normalized(read_batches(path, chunk_size), year)):
+            table, bridges = pipeline.split_model(batch)
+            # Encoded as loaders return them, so ordinal values count in declared order
+            table = store.to_dictionary_encoded(table.reset_index(drop=True))
+            bridges = {field: store.to_dictionary_encoded(b) for field, b in bridges.items()}
+            store.write_partition(table, staging, "respondents", part)
+            for field, bridge in bridges.items():
+                store.write_partition(bridge, staging, field, part)
+                bridge_rows[field] += len(bridge)
+            if explode:
+                exploded = pipeline.explode(batch)[pipeline.OUTPUT_COLUMNS]
+                expanded.write(store.to_dictionary_encoded(exploded))
+                rows += len(exploded)
+
+            counts = cube.add_respondents(counts, model.SurveyModel(table, bridges))
+            respondents += len(table)
+            parts = part + 1
+            print(f"part {part}: {len(table):,} respondents ({respondents:,} total)")
+    finally:
+        expanded.close()
+    if not parts:
+        raise ValueError(f"{path} has no responses")
+
+    for table in ["respondents"] + config.MULTI_SELECT:
+        store.write_mmap_partitioned(table, staging, year)
+    survey = _mmap_model(year)
+    store.write_parquet_batches(survey.respondents, store.respondents_path(year), chunk_size)
+    for field, bridge in survey.bridges.items():
+        store.write_parquet_batches(bridge, store.bridge_path(field, year), chunk_size)
+    shutil.rmtree(staging)
+
+    inputs = f"{pipeline.rules_digest()}-{year}-{pipeline.file_digest(path)}"
+    store.write_cube(counts, year)
+    store.write_questions(questions.compile_banks(survey, inputs), year)
+    outputs = pipeline.output_paths(year, store.expanded_path(year) if explode else None)
+    manifest = {
+        "inputs": inputs,
+        "outputs": pipeline.output_digests(outputs),
+        "source": str(path),
+        "chunk_size": chunk_size,
+        "parts": parts,
+        "respondents": respondents,
+        "rows": rows,
+        "bridge_rows": bridge_rows,
+    }
+    (config.build_dir(year) / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _mmap_model(year):
+    """The partition's tables as written to the memory-mapped layout."""
+    return model.SurveyModel(
+        store.load_mmap("respondents", year=year),
+        {field: store.load_mmap(field, year=year) for field in config.MULTI_SELECT},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a raw survey CSV in bounded-memory batches.")
+    parser.add_argument("source", type=Path, help="raw survey CSV")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--year", type=int, default=None,
+                        help="survey year of the rows (default: the current one)")
+    parser.add_argument("--no-explode", action="store_true",
+                        help="skip the exploded table (the model and cube do not need it)")
+    args = parser.parse_args()
+
+    manifest = ingest(args.source, args.year, args.chunk_size, explode=not args.no_explode)
+    print(json.dumps(manifest, indent=2))
+    print(f"wrote {config.model_dir(args.year or config.CURRENT_YEAR)}")
+
+
+if __name__ == "__main__":
+    main()
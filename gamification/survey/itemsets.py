@@ -0,0 +1,106 @@
+"""Frequent option combinations of the multi-select fields (Apriori).
+
+An item is one option of a multi-select field (team_focus,
+modeling_pain_points, ai_helps_with); an itemset is the respondents who
+selected all of its items. Itemsets are mined level by level: the k-sets
+counted are those whose every (k-1)-subset reached `min_support`, and each
+level's candidates are counted in one engine.sizes() call (popcounts of
+ANDed option bitsets, or one FILTER column each in SQL):
+
+    found = itemsets.mine(engine, selections, min_support=0.05, max_size=3)
+    itemsets.prevalence(engine, selections, found.head(10), "org_size")
+
+Combinations are computed on demand for any filter state, so nothing
+combinatorial is stored by the pipeline.
+"""
+import itertools
+import math
+
+import pandas as pd
+
+from survey import config
+from survey.cohort import And, Term
+
+COLUMNS = ["itemset", "items", "size", "respondents", "support", "lift"]
+
+
+def items(fields=None):
+    """(field, option) items of `fields` (default: every multi-select field)."""
+    return [(field, option) for field in (fields or config.MULTI_SELECT)
+            for option in config.MULTI_SELECT_OPTIONS[field]]
+
+
+def as_cohort(itemset):
+    """Cohort of respondents who selected every item, named "A + B"."""
+    return And(tuple(Term(field, [option]) for field, option in itemset),
+               " + ".join(option for _, option in itemset))
+
+
+def mine(engine, source, fields=None, min_support=0.05, max_size=3, min_size=2):
+    """Itemsets of `fields` held by at least `min_support` of a source's respondents.
+
+    One row per itemset of `min_size` to `max_size` items, by support
+    (descending): its label, items ((field, option) tuples), size,
+    respondents, support (% of the source) and lift (support over the
+    product of its items' supports; 1 means they co-occur as often as if
+    independent).
+    """
+    total = engine.size(source)
+    if not total:
+        return pd.DataFrame(columns=COLUMNS)
+    threshold = max(1, math.ceil(min_support * total))
+    candidates = [(item,) for item in items(fields)]
+    single, rows = {}, []
+    for size in range(1, max_size + 1):
+        if not candidates:
+            break
+        counts = engine.sizes(source, [as_cohort(c) for c in candidates])
+        frequent = {c: int(n) for c, n in zip(candidates, counts) if n >= threshold}
+        if size == 1:
+            single = {c[0]: n / total for c, n in frequent.items()}
+        if size >= min_size:
+            for itemset, n in frequent.items():
+                expected = math.prod(single[item] for item in itemset)
+                rows.append((as_cohort(itemset).name, itemset, size, n,
+                             round(n / total * 100, 1), round(n / total / expected, 2)))
+        candidates = _next_level(sorted(frequent))
+    result = pd.DataFrame(rows, columns=COLUMNS)
+    return result.sort_values(["support", "size"], ascending=[False, True], ignore_index=True)
+
+
+def prevalence(engine, source, found, segment):
+    """% of each `segment` value's respondents holding each itemset of `found`.
+
+    Long format (itemset, segment, respondents, segment_size, pct, vs_all),
+    where vs_all is pct over the itemset's support in the whole source.
+    All itemsets are counted in one engine.compare() pass.
+    """
+    columns = ["itemset", segment, "respondents", "segment_size", "pct", "vs_all"]
+    if found.empty:
+        return pd.DataFrame(columns=columns)
+    # compare() results are shared through the engine cache: never modify them
+    wide = engine.compare(source, [as_cohort(i) for i in found["items"]], segment)
+    wide = wide.drop(columns="respondents")
+    result = wide.rename_axis("itemset").rename_axis(segment, axis=1).stack()
+    result = result.rename("respondents").reset_index()
+    sizes = engine.counts(source, segment)
+    result["segment_size"] = result[segment].map(sizes).fillna(0).astype("int64")
+    result = result[result["segment_size"] > 0].copy()
+    result["pct"] = (result["respondents"] / result["segment_size"] * 100).round(1)
+    support = found.set_index("itemset")["support"]
+    result["vs_all"] = (result["pct"] / result["itemset"].map(support)).round(2)
+    return result[columns].reset_index(drop=True)
+
+
+def _next_level(frequent):
+    """Apriori candidates: joins of sorted k-sets sharing their first k-1 items,
+    kept only when every k-subset is frequent."""
+    known = set(frequent)
+    candidates = []
+    for a, b in itertools.combinations(frequent, 2):
+        if a[:-1] != b[:-1]:
+            continue
+        candidate = a + b[-1:]
+        if all(sub in known for sub in itertools.combinations(candidate, len(a))):
+            candidates.append(candidate)
+    return candidates
@@ -0,0 +1,133 @@
+"""Explorer engine and Game stats over a survey that grows while it is served.
+
+    live = LiveSurvey.load(columns)      # pipeline output, as the Explorer loads it
+    engine = live.engine                 # CachedEngine over a CubeEngine
+    live.append(raw_rows)                # new responses, raw CSV columns
+
+append() runs the new rows through pipeline.normalize and adds them into
+the cube cells they fall in (cube.add_respondents), so every per-dimension
+and per-pair count is updated without recounting the existing respondents,
+at a cost that grows with the batch rather than with the cube. The bitmap
+index is extended with the new rows' bitsets and the Game's Higher/Lower
+count tables the same way (questions.RateEngine.extend). In the aggregate
+cache only entries whose filter state matches at least one new respondent
+are dropped; the others still describe exactly the same respondents.
+Callbacks registered with on_append() get the new rows' index to do the
+same for caches kept elsewhere (survey.data, survey.api).
+
+Appended rows live in memory only. To keep them, append them to the raw
+survey CSV as well: the next pipeline.build() then normalizes just those rows.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from survey import config, cube, pipeline, questions, store
+from survey.bitmap import BitmapIndex, index_columns
+from survey.cache import CachedEngine, selection_key
+from survey.model import SurveyModel, load_model
+
+
+def affected(delta_index):
+    """Predicate: does a filter state ({column: values}) match a new respondent?
+
+    `delta_index` indexes the new respondents; answers are memoized per
+    filter state.
+    """
+    memo = {}
+
+    def matches(selections):
+        key = selection_key(selections)
+        if key not in memo:
+            memo[key] = delta_index.count(delta_index.filter(dict(key))) > 0
+        return memo[key]
+
+    return matches
+
+
+def _root_selection(source_key):
+    """Selection key a source key derives from (cohort keys nest their parent's)."""
+    while len(source_key) >= 2 and source_key[1] == "split":
+        source_key = source_key[0]
+    return source_key
+
+
+class LiveSurvey:
+    """A SurveyModel with its cube, bitmap index, cached engine and rate tables."""
+
+    def __init__(self, model, counts, maxsize=None):
+        self.model = model
+        self.cube = counts
+        self.index = BitmapIndex.from_model(model, index_columns(model))
+        self.engine = CachedEngine(cube.CubeEngine(model, self.index, counts), maxsize)
+        self.rates = questions.RateEngine(model.respondents)
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, columns=None, maxsize=None, years=None):
+        """The pipeline output of `years` (built first if an input changed).
+
+        Appended respondents belong to the current survey year.
+        """
+        pipeline.build_years(years or [config.CURRENT_YEAR])
+        return cls(load_model(columns, years), cube.load_cube(years), maxsize)
+
+    def next_id(self):
+        ids = self.model.respondents["id"]
+        return int(ids.max()) + 1 if len(ids) else 0
+
+    def on_append(self, callback):
+        """Call `callback(delta_index)` after each append.
+
+        `delta_index` is a BitmapIndex over the new respondents alone (every
+        config.FILTER_COLUMNS column); pass it to affected() to test filter
+        states.
+        """
+        self._listeners.append(callback)
+
+    def append(self, raw):
+        """Add raw survey rows (raw CSV columns, no id); returns their ids."""
+        with self._lock:
+            raw = raw.drop(columns=["id"], errors="ignore").reset_index(drop=True)
+            raw.insert(0, "id", np.arange(self.next_id(), self.next_id() + len(raw)))
+            table, bridges = pipeline.split_model(pipeline.normalize(raw))
+            # Encoded as loaders return them, so ordinal values count in declared order.
+            # Every cube dimension, whatever columns the served model holds
+            delta = SurveyModel(
+                store.to_dictionary_encoded(table.reset_index(drop=True)),
+                {field: store.to_dictionary_encoded(b) for field, b in bridges.items()},
+            )
+            self.cube = cube.add_respondents(self.cube, delta)
+
+            columns = list(self.model.respondents.columns)
+            self.model = SurveyModel(
+                store.to_dictionary_encoded(pd.concat(
+                    [self.model.respondents, delta.respondents[columns]], ignore_index=True
+                )),
+                {field: store.to_dictionary_encoded(pd.concat(
+                    [bridge, delta.bridges[field]], ignore_index=True
+                )) for field, bridge in self.model.bridges.items()},
+            )
+            delta_index = BitmapIndex.from_model(
+                delta, list(dict.fromkeys([*self.index.bitmaps, *config.FILTER_COLUMNS]))
+            )
+            self.index = self.index.append(delta_index)
+            self.engine.engine = cube.CubeEngine(self.model, self.index, self.cube)
+            self.rates.extend(table[[c for c in columns if c in table]])
+            self._invalidate(delta_index)
+            for callback in self._listeners:
+                callback(delta_index)
+            return raw["id"].to_numpy()
+
+    def _invalidate(self, delta_index):
+        """Drop cached aggregates whose filter state matches a new respondent."""
+        matches = affected(delta_index)
+        self.engine.cache.discard(
+            lambda key: key[0] in ("values", "total") or matches(dict(_root_selection(key[0])))
+        )
+
+    def hl_bank(self, specs=None):
+        """Higher/Lower questions over every respondent so far."""
+        return questions.HLBank(questions.build_hl_stats(self.model, specs, self.rates))
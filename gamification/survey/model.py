@@ -0,0 +1,112 @@
+"""Star-schema view of the survey and the aggregations built on it.
+
+Instead of one exploded row per team_focus × modeling_pain_points ×
+ai_helps_with combination, the survey is held as:
+
+    respondents             one row per respondent, single-valued columns
+    bridges[field]          (id, option), one row per selected option
+
+A query joins only the bridges for the multi-select dimensions it touches,
+so every (id, dim values) row it sees is unique and COUNT(DISTINCT id)
+becomes a plain row count.
+"""
+import numpy as np
+import pandas as pd
+
+from survey import aggregate, config, store
+
+
+class SurveyModel:
+    """Respondent table plus multi-select bridge tables."""
+
+    def __init__(self, respondents, bridges):
+        self.respondents = respondents
+        self.bridges = bridges
+        self._rows = {}
+
+    def is_multi(self, dim):
+        return dim in self.bridges
+
+    def frame(self, respondents, *dims):
+        """`respondents` (a row subset of the table) with `dims`, one row per distinct combination.
+
+        Single-valued dims come from the respondent rows; multi-select dims
+        are joined from their bridge, restricted to the given respondents.
+        """
+        dims = list(dict.fromkeys(dims))
+        multi = [d for d in dims if self.is_multi(d)]
+        scalar = [d for d in dims if not self.is_multi(d)]
+        if not multi:
+            return respondents[["id"] + scalar]
+
+        # Restrict the first bridge with a positional mask instead of a merge
+        positions = self.respondents.index.get_indexer(respondents.index)
+        selected = np.zeros(len(self.respondents), dtype=bool)
+        selected[positions] = True
+        rows = self._bridge_rows(multi[0])
+        keep = (rows >= 0) & selected[rows]
+        out = self.bridges[multi[0]][keep].reset_index(drop=True)
+        for dim in scalar:
+            out[dim] = self.respondents[dim].iloc[rows[keep]].reset_index(drop=True)
+        for dim in multi[1:]:
+            out = out.merge(self.bridges[dim], on="id")
+        return out
+
+    def _bridge_rows(self, field):
+        """Respondent-table row of each bridge row (cached per field)."""
+        if field not in self._rows:
+            self._rows[field] = pd.Index(self.respondents["id"]).get_indexer(
+                self.bridges[field]["id"]
+            )
+        return self._rows[field]
+
+    def counts(self, respondents, dim):
+        """Respondents per value of `dim`, in value order."""
+        frame = self.frame(respondents, dim)
+        return aggregate.distinct_count(frame["id"], frame[dim], unique=True)
+
+    def pair_counts(self, respondents, row_dim, col_dim):
+        """Respondents per (row_dim, col_dim) value pair, as a MultiIndex series."""
+        frame = self.frame(respondents, row_dim, col_dim)
+        return aggregate.distinct_count_2d(
+            frame["id"], frame[row_dim], frame[col_dim], unique=True
+        )
+
+    def cell_counts(self, respondents, dims):
+        """Respondents per combination of values of `dims` (1-D index for one dim)."""
+        if len(dims) == 1:
+            return self.counts(respondents, dims[0])
+        frame = self.frame(respondents, *dims)
+        return aggregate.distinct_count_nd(
+            frame["id"], [frame[dim] for dim in dims], unique=len(set(dims)) == len(dims)
+        )
+
+
+def load_model(columns=None, years=None):
+    """Load the respondent table (optionally only `columns`) and every bridge.
+
+    Only the partitions of `years` (default: the current survey year) are
+    read. Several years are concatenated with ids shifted by
+    store.id_offsets, so COUNT(DISTINCT id) never merges respondents of
+    different years.
+    """
+    if columns is not None:
+        columns = ["id"] + [c for c in columns if c != "id" and c not in config.MULTI_SELECT]
+    years = list(years or [config.CURRENT_YEAR])
+    if len(years) == 1:
+        return SurveyModel(
+            store.load_respondents(columns, years[0]),
+            {field: store.load_bridge(field, years[0]) for field in config.MULTI_SELECT},
+        )
+
+    offsets = store.id_offsets(years)
+
+    def combined(load):
+        frames = [load(year).assign(id=lambda f, y=year: f["id"] + offsets[y]) for year in years]
+        return store.to_dictionary_encoded(pd.concat(frames, ignore_index=True))
+
+    return SurveyModel(
+        combined(lambda year: store.load_respondents(columns, year)),
+        {field: combined(lambda year, f=field: store.load_bridge(f, year))
+         for field in config.MULTI_SELECT},
+    )
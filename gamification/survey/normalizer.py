@@ -0,0 +1,203 @@
+"""Freetext normalization rules compiled into one lookup per mapping file.
+
+Mapping files are CSVs of (Original_Response, Category) with an optional
+Match column:
+
+    exact       (default) the stripped answer equals Original_Response
+    contains    Original_Response occurs in the answer, ignoring case
+    regex       Original_Response is a regular expression found in the
+                answer, ignoring case
+
+Exact rules go into a dict keyed on the stripped text. Contains and regex
+rules are compiled into a single alternation, one named group per rule
+(keywords longest first, then the regexes in file order), so one scan per
+answer finds the leftmost rule match whatever the number of rules; at the
+same position the earlier alternative wins. Exact rules win over both.
+Answers matching nothing map to `default`.
+
+Freetext repeats heavily, so a column is factorized and only its distinct
+values are resolved; resolved values are memoized on the normalizer, which
+pipeline.normalizer() keeps per mapping file across batches.
+
+A normalizer can also carry a FuzzyMatcher for answers no rule matches: the
+nearest known answer by character 3-gram TF-IDF cosine similarity lends its
+category when the score reaches `min_score`. Decisions are persisted, so each
+new string is scored once, and a review CSV lists the low-confidence ones.
+"""
+import hashlib
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class FreetextNormalizer:
+    """Raw answer -> category, for one mapping file."""
+
+    def __init__(self, exact, keywords=None, default="Other", patterns=None):
+        self.exact = exact            # {stripped answer: category}
+        self.keywords = keywords or {}  # {casefolded keyword: category}
+        self.patterns = patterns or {}  # {regex: category}, tried in order
+        self.default = default
+        keywords = sorted(self.keywords.items(), key=lambda rule: len(rule[0]), reverse=True)
+        alternatives = [re.escape(keyword) for keyword, _ in keywords] + list(self.patterns)
+        self.categories = [category for _, category in keywords] + list(self.patterns.values())
+        self.pattern = None
+        if alternatives:
+            # The rule's own group closes last, so lastgroup names it
+            self.pattern = re.compile("|".join(
+                f"(?P<r{i}>{alternative})" for i, alternative in enumerate(alternatives)
+            ), re.IGNORECASE)
+        self.fuzzy = None             # FuzzyMatcher for answers no rule matches
+        self._memo = {}
+
+    @classmethod
+    def from_csv(cls, path, default="Other"):
+        rules = pd.read_csv(path, dtype=str)
+        match = rules["Match"].fillna("exact") if "Match" in rules else "exact"
+        rules = rules.assign(Match=match, Original_Response=rules["Original_Response"].str.strip())
+        unknown = set(rules["Match"]) - {"exact", "contains", "regex"}
+        if unknown:
+            raise ValueError(f"{path}: unknown Match value(s) {sorted(unknown)}")
+        exact = rules[rules["Match"] == "exact"]
+        contains = rules[rules["Match"] == "contains"]
+        regex = rules[rules["Match"] == "regex"]
+        try:
+            return cls(
+                dict(zip(exact["Original_Response"], exact["Category"])),
+                dict(zip(contains["Original_Response"].str.casefold(), contains["Category"])),
+                default,
+                dict(zip(regex["Original_Response"], regex["Category"])),
+            )
+        except re.error as e:
+            raise ValueError(f"{path}: invalid regex rule: {e}") from e
+
+    def lookup(self, value):
+        """Category of one raw answer, or None if no rule matches."""
+        if not isinstance(value, str):
+            return None
+        text = value.strip()
+        if text in self.exact:
+            return self.exact[text]
+        if self.pattern is not None:
+            found = self.pattern.search(text)
+            if found:
+                return self.categories[int(found.lastgroup[1:])]
+        return None
+
+    def __call__(self, values):
+        """Categories for a Series of raw answers; missing or unmatched ones get `default`."""
+        codes, uniques = pd.factorize(values)
+        pending = [value for value in uniques if value not in self._memo]
+        for value in pending:
+            self._memo[value] = self.lookup(value)
+        if self.fuzzy is not None:
+            unmatched = [v for v in pending if self._memo[v] is None and isinstance(v, str)]
+            self._memo.update(self.fuzzy.match(unmatched))
+        resolved = np.empty(len(uniques) + 1, dtype=object)
+        for i, value in enumerate(uniques):
+            resolved[i] = self._memo[value]
+        resolved[-1] = None  # code -1: missing answer
+        out = pd.Series(resolved[codes], index=values.index, name=values.name)
+        return out if self.default is None else out.fillna(self.default)
+
+
+# ============================================================
+# FUZZY MATCHING
+# ============================================================
+def ngrams(text, n=3):
+    """Character n-grams of casefolded, whitespace-collapsed text, space-padded."""
+    padded = f" {' '.join(text.casefold().split())} "
+    return [padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))]
+
+
+class FuzzyMatcher:
+    """Category of the nearest known answer, by 3-gram TF-IDF cosine similarity.
+
+    Decisions (category or None, nearest known answer, score) are kept per
+    distinct string and, with a `cache_path`, persisted as JSON keyed on the
+    rules and `min_score`, so a string is only scored once across runs. Every
+    decision scoring below `review_score` is listed in <cache stem>_review.csv.
+    """
+
+    def __init__(self, originals, categories, min_score=0.5, review_score=0.8, cache_path=None):
+        self.originals = list(originals)
+        self.categories = list(categories)
+        self.min_score = min_score
+        self.review_score = review_score
+        self.cache_path = cache_path
+        self.key = hashlib.sha256(json.dumps(
+            [sorted(zip(self.originals, self.categories)), min_score]
+        ).encode()).hexdigest()
+
+        grams = [ngrams(text) for text in self.originals]
+        self.vocab = {g: i for i, g in enumerate(sorted({g for row in grams for g in row}))}
+        df = np.zeros(len(self.vocab))
+        for row in grams:
+            df[[self.vocab[g] for g in set(row)]] += 1
+        self.idf = np.log((1 + len(grams)) / (1 + df)) + 1
+        self.matrix = self._vectors(grams)
+        self.decisions = self._load()
+
+    @classmethod
+    def from_rules(cls, exact, **kwargs):
+        """Matcher over the exact rules ({answer: category}) of a normalizer."""
+        return cls(exact.keys(), exact.values(), **kwargs)
+
+    def _vectors(self, grams):
+        """L2-normalized TF-IDF rows; n-grams outside the vocabulary are dropped."""
+        out = np.zeros((len(grams), len(self.vocab)))
+        for row, text_grams in enumerate(grams):
+            cols = [self.vocab[g] for g in text_grams if g in self.vocab]
+            np.add.at(out[row], cols, 1)
+        out *= self.idf
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return np.divide(out, norms, out=out, where=norms > 0)
+
+    def scores(self, values):
+        """(index of nearest known answer, cosine similarity) per value."""
+        if not values or not self.originals:
+            return np.zeros(len(values), dtype=int), np.zeros(len(values))
+        similarity = self._vectors([ngrams(v) for v in values]) @ self.matrix.T
+        nearest = similarity.argmax(axis=1)
+        return nearest, similarity[np.arange(len(values)), nearest]
+
+    def match(self, values):
+        """{value: category, or None below min_score} for each of `values`."""
+        new = [v for v in dict.fromkeys(values) if v not in self.decisions]
+        # Score in blocks so the dense query matrix stays small
+        for start in range(0, len(new), 1024):
+            block = new[start:start + 1024]
+            nearest, score = self.scores(block)
+            for value, i, s in zip(block, nearest, score):
+                category = self.categories[i] if s >= self.min_score else None
+                self.decisions[value] = (category, self.originals[i], round(float(s), 4))
+        if new:
+            self._save()
+        return {v: self.decisions[v][0] for v in values}
+
+    def review(self):
+        """Decisions scoring below review_score, least confident first."""
+        rows = [(value, *decision) for value, decision in self.decisions.items()
+                if decision[2] < self.review_score]
+        frame = pd.DataFrame(rows, columns=["value", "Category", "nearest", "score"])
+        return frame.sort_values("score", kind="stable").reset_index(drop=True)
+
+    def _load(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        stored = json.loads(self.cache_path.read_text())
+        if stored.get("key") != self.key:
+            return {}
+        return {value: tuple(decision) for value, decision in stored["decisions"].items()}
+
+    def _save(self):
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_path.write_text(json.dumps(
+            {"key": self.key, "decisions": self.decisions}, ensure_ascii=False, indent=1
+        ))
+        self.review().to_csv(self.cache_path.with_name(f"{self.cache_path.stem}_review.csv"),
+                             index=False)
@@ -0,0 +1,326 @@
+"""Build pipeline: raw survey CSV -> cleaned, exploded dataset.
+
+    python -m survey.pipeline               # from gamification/
+    python -m survey.pipeline --force       # ignore cached stages
+    python -m survey.pipeline --year 2026   # one survey year only
+
+Every raw survey (data/survey_<year>_data_engineering.csv) is built into its
+own partition, data/model/year=<year>/: expanded.parquet, the star-schema
+tables, the pre-aggregated cube and the compiled Game question banks (see
+survey.store, survey.model, survey.cube and survey.questions), with its
+stage caches and manifest in data/build/year=<year>/.
+
+Stages are content-hashed. The whole build is skipped when the raw survey,
+the mapping files and PIPELINE_VERSION are unchanged. Otherwise each stage
+keeps its previous output keyed by a hash of every input row, so appending a
+batch of responses only normalizes and explodes the new rows.
+"""
+import argparse
+import functools
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from survey import config, cube, model, questions, store
+from survey.normalizer import FreetextNormalizer, FuzzyMatcher
+
+# Bump when stage logic changes so cached stage outputs are discarded
+PIPELINE_VERSION = 6
+
+# Unmapped storage answers adopt the nearest known answer's Category at or
+# above this similarity (bump PIPELINE_VERSION when changing it). Against the
+# platform rules, one-character typos of known answers score >= 0.73 in 9 of
+# 10 cases and reordered words >= 0.79, while 9 in 10 unrelated answers (the
+# orchestration mapping's) score under 0.45: 0.5 takes the variants and
+# leaves the rest to Category = empty and the review CSV.
+FUZZY_MIN_SCORE = 0.5
+
+OUTPUT_COLUMNS = [
+    "id", "survey_year", "timestamp", "role", "org_size", "industry", "team_focus",
+    "storage_environment", "orchestration", "ai_usage_frequency",
+    "ai_helps_with", "ai_adoption", "modeling_approach",
+    "modeling_pain_points", "architecture_trend", "biggest_bottleneck",
+    "team_growth_2026", "education_topic", "industry_wish", "region",
+    "role_clean", "management_vs_non", "modeling_clean", "bottleneck_clean",
+    "orchestration_clean", "fights_fires", "num_focuses", "num_pains",
+    "Original_Response", "Category", "architecture_clean", "education_clean",
+]
+
+# (raw column, clean column, mapping file)
+FREETEXT_RULES = [
+    ("role", "role_clean", config.ROLE_MAPPING),
+    ("modeling_approach", "modeling_clean", config.MODELING_MAPPING),
+    ("biggest_bottleneck", "bottleneck_clean", config.BOTTLENECK_MAPPING),
+    ("orchestration", "orchestration_clean", config.ORCHESTRATION_MAPPING),
+]
+
+ARCHITECTURE_MAP = {
+    "Centralized warehouse": "Centralized warehouse",
+    "Lakehouse": "Lakehouse",
+    "Data mesh / federated ownership": "Data mesh / federated",
+    "Event-driven architecture": "Event-driven",
+}
+
+# education_topic freetext outside these is bucketed into "Other"
+EDUCATION_TOPICS = [
+    "AI/LLM integration", "Data modeling",
+    "Semantics / ontologies / knowledge graphs",
+    "Architecture patterns", "Streaming / event-driven systems",
+    "Career growth / leadership", "Reliability engineering",
+]
+
+
+# ============================================================
+# HASHING
+# ============================================================
+def file_digest(*paths):
+    """SHA-256 over the contents of several files."""
+    h = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def rules_digest():
+    """Hash of everything besides the raw rows that affects stage output."""
+    paths = [config.PLATFORM_MAPPING] + [path for _, _, path in FREETEXT_RULES]
+    return f"v{PIPELINE_VERSION}-{file_digest(*paths)}"
+
+
+def row_hashes(frame):
+    """One stable hex digest per row, over all columns (including id)."""
+    return pd.util.hash_pandas_object(frame, index=False).map("{:016x}".format)
+
+
+# ============================================================
+# STAGES
+# ============================================================
+def normalizer(path, default="Other", fuzzy=False):
+    """Compiled rules of a mapping file, reused until the file changes.
+
+    With `fuzzy`, answers no rule matches take the category of the nearest
+    known answer (see survey.normalizer.FuzzyMatcher); decisions are cached
+    in data/build/<mapping>_fuzzy.json with a _fuzzy_review.csv beside it.
+    """
+    return _compiled(path, path.stat().st_mtime_ns, default, fuzzy)
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled(path, mtime, default, fuzzy):
+    compiled = FreetextNormalizer.from_csv(path, default)
+    if fuzzy:
+        compiled.fuzzy = FuzzyMatcher.from_rules(
+            compiled.exact, min_score=FUZZY_MIN_SCORE,
+            cache_path=config.BUILD_DIR / f"{path.stem}_fuzzy.json",
+        )
+    return compiled
+
+
+def load_raw(path=None):
+    """Raw survey with a positional respondent id (stable under appends)."""
+    raw = pd.read_csv(path or config.RAW_SURVEY)
+    raw.insert(0, "id", np.arange(len(raw)))
+    return raw
+
+
+def split_options(value, options):
+    """Split a comma-joined multi-select answer into its known options."""
+    if pd.isna(value):
+        return []
+    found = [(value.find(opt), opt) for opt in options if opt in value]
+    if not found:
+        return [value.strip()]
+    return [opt for _, opt in sorted(found)]
+
+
+def normalize(raw, year=None):
+    """Respondent-level cleaning: freetext mapping, flags, storage merge.
+
+    Rows are tagged with `year` (default: the current survey year) unless
+    they already carry a survey_year. Multi-select columns come out as
+    lists, ready for explode().
+    """
+    out = raw.copy()
+    if "survey_year" not in out:
+        out.insert(1, "survey_year", year or config.CURRENT_YEAR)
+
+    for src, dst, path in FREETEXT_RULES:
+        out[dst] = normalizer(path)(out[src])
+    out.insert(out.columns.get_loc("role_clean") + 1, "management_vs_non", np.where(
+        out["role_clean"] == "Manager / Director / VP", "Management", "Non-Management"
+    ))
+
+    for col, options in config.MULTI_SELECT_OPTIONS.items():
+        out[col] = out[col].map(lambda v, opts=options: split_options(v, opts))
+
+    out["fights_fires"] = out["team_focus"].map(lambda items: "Fighting fires" in items)
+    out["num_focuses"] = out["team_focus"].map(lambda items: len(set(items)))
+    out["num_pains"] = out["modeling_pain_points"].map(lambda items: len(set(items)))
+
+    # Storage mapping merge: answers not in the mapping are fuzzy-matched to
+    # a known one and keep a missing Category if nothing is close enough
+    out["storage_environment"] = out["storage_environment"].str.strip()
+    platform = normalizer(config.PLATFORM_MAPPING, default=None, fuzzy=True)
+    out["Original_Response"] = out["storage_environment"].where(
+        out["storage_environment"].isin(list(platform.exact))
+    )
+    out["Category"] = platform(out["storage_environment"])
+
+    out["architecture_clean"] = out["architecture_trend"].map(ARCHITECTURE_MAP).fillna("Other")
+    out["education_clean"] = out["education_topic"].where(
+        out["education_topic"].isin(EDUCATION_TOPICS), "Other"
+    )
+    return out
+
+
+def split_model(respondents):
+    """Respondent table (multi-select lists dropped) and one (id, option) bridge per field."""
+    table = respondents[[c for c in OUTPUT_COLUMNS if c not in config.MULTI_SELECT]]
+    bridges = {
+        field: respondents[["id", field]].explode(field).dropna()
+        .drop_duplicates().reset_index(drop=True)
+        for field in config.MULTI_SELECT
+    }
+    return table, bridges
+
+
+def explode(respondents):
+    """One row per team_focus × modeling_pain_points × ai_helps_with combination."""
+    out = respondents
+    for col in config.MULTI_SELECT:
+        out = out.explode(col)
+    return out
+
+
+# ============================================================
+# INCREMENTAL EXECUTION
+# ============================================================
+def run_incremental(name, frame, fn, key, force=False, year=None):
+    """Apply a row-wise stage, reusing cached output for rows seen before.
+
+    `frame` must carry a `_row_hash` column. The stage's previous output is
+    stored under data/build/year=<year>/<name>.pkl together with `key`; a
+    different key (rules or pipeline version changed) invalidates the whole
+    cache.
+    """
+    cache_path = config.build_dir(year) / f"{name}.pkl"
+    cached = None
+    if not force and cache_path.exists():
+        stored = pd.read_pickle(cache_path)
+        if stored["key"] == key:
+            cached = stored["rows"]
+
+    if cached is None:
+        new_rows = frame
+        kept = frame.iloc[0:0]
+        result = fn(frame)
+    else:
+        is_new = ~frame["_row_hash"].isin(cached["_row_hash"])
+        new_rows = frame[is_new]
+        kept = cached[cached["_row_hash"].isin(frame["_row_hash"])]
+        result = kept if new_rows.empty else pd.concat([kept, fn(new_rows)])
+
+    result = result.sort_values("id", kind="stable").reset_index(drop=True)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    pd.to_pickle({"key": key, "rows": result}, cache_path)
+    print(f"{name}: {len(new_rows):,} rows processed, {len(frame) - len(new_rows):,} cached")
+    return result
+
+
+def read_manifest(year=None):
+    path = config.build_dir(year) / "manifest.json"
+    if path.exists():
+        return json.loads(path.read_text())
+    return {}
+
+
+def output_paths(year=None, expanded=None):
+    """Files of a built partition: `expanded` (if any), the model, cube and question banks."""
+    return [path for path in [expanded] if path is not None] + [
+        store.respondents_path(year), store.cube_path(year), store.questions_path(year),
+        store.mmap_schema_path("respondents", year),
+    ] + [store.bridge_path(field, year) for field in config.MULTI_SELECT]
+
+
+def output_digests(paths):
+    return {str(path): file_digest(path) for path in paths}
+
+
+def build(force=False, raw_path=None, output=None, year=None):
+    """Build one survey year's partition if any of its inputs changed.
+
+    `year` defaults to the current survey year and `raw_path` to the raw
+    survey the partition was last built from, else that year's raw survey.
+    A partition written by survey.ingest is ingested again the same way,
+    and kept as it is if its source file is gone.
+    Returns the path of the expanded dataset.
+    """
+    year = year or config.CURRENT_YEAR
+    manifest = read_manifest(year)
+    raw_path = Path(raw_path or manifest.get("source") or config.RAW_SURVEYS.get(
+        year, config.DATA_DIR / f"survey_{year}_data_engineering.csv"
+    ))
+    output = output or store.expanded_path(year)
+    outputs = output_paths(year, output)
+    recorded = manifest.get("outputs") or {}
+    intact = bool(recorded) and all(Path(path).exists() for path in recorded) \
+        and output_digests(recorded) == recorded
+    if not force and intact and not raw_path.exists():
+        return output  # source removed (e.g. an ingested archive): keep the partition
+    inputs = f"{rules_digest()}-{year}-{file_digest(raw_path)}"
+    if not force and intact and manifest.get("inputs") == inputs:
+        return output
+    if "chunk_size" in manifest:
+        from survey import ingest  # imports this module
+        ingest.ingest(raw_path, year, manifest["chunk_size"], str(output) in recorded)
+        return output
+
+    key = rules_digest()
+    raw = load_raw(raw_path)
+    raw["_row_hash"] = row_hashes(raw)
+
+    respondents = run_incremental("respondents", raw, functools.partial(normalize, year=year),
+                                  key, force, year)
+    expanded = run_incremental("expanded", respondents, explode, key, force, year)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    store.write_parquet(expanded[OUTPUT_COLUMNS], output)
+    table, bridges = split_model(respondents)
+    store.write_model(table, bridges, year)
+    survey = model.load_model(years=[year])
+    store.write_cube(cube.build_cube(survey), year)
+    store.write_questions(questions.compile_banks(survey, inputs), year)
+    (config.build_dir(year) / "manifest.json").write_text(json.dumps({
+        "inputs": inputs,
+        "outputs": output_digests(outputs),
+        "source": str(raw_path),
+        "respondents": len(table),
+        "rows": len(expanded),
+        "bridge_rows": {field: len(bridge) for field, bridge in bridges.items()},
+    }, indent=2))
+    return output
+
+
+def build_years(years=None, force=False):
+    """build() every year in `years` (default: every raw survey found)."""
+    return [build(force, year=year) for year in years or config.YEARS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="rebuild every stage")
+    parser.add_argument("--year", type=int, action="append",
+                        help="survey year to build, repeatable (default: every year)")
+    args = parser.parse_args()
+    for year, path in zip(args.year or config.YEARS, build_years(args.year, args.force)):
+        print(json.dumps(read_manifest(year), indent=2))
+        print(f"wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""Question banks for the Game page.
+
+Both builders take a SurveyModel (see survey.model) and return sequences
+of question dicts with their reveal-chart data embedded, so they run (and
+can be benchmarked) outside Streamlit. Higher/Lower questions come as an
+HLBank, which stores one record per stat and builds each pair on access.
+
+The pipeline compiles both banks into data/model/questions.json.gz, tagged
+with BANK_VERSION and the dataset digest, and the Game page only reads that
+file (load_banks), so its cold start does not touch the survey data.
+
+Higher/Lower questions are declared as rate specs (HL_SPECS):
+
+    metric      column whose value is tested
+    values      the respondent counts as a hit when `metric` is one of these
+    group_by    column defining the groups compared
+    groups      group labels in chart order (None: every observed group, sorted)
+    context, category, chart_title    question text
+
+and RateEngine computes every group's rate for a spec in one grouped pass.
+"""
+import numpy as np
+import pandas as pd
+
+from survey import aggregate, config, model as survey_model, pipeline, store
+
+# Bump when the questions or their format change, to recompile stored banks
+BANK_VERSION = 3
+
+ROLES = ["Data Engineer", "Analytics Engineer", "Manager / Director / VP", "Data Architect"]
+ORG_SIZES = config.CATEGORY_ORDER["org_size"]
+DAILY_AI = ["Multiple times per day", "Daily"]
+
+
+# ============================================================
+# HIGHER / LOWER SPECS
+# ============================================================
+HL_SPECS = [
+    # 1. Bottleneck by role
+    *[{
+        "metric": "bottleneck_clean", "values": [bn],
+        "group_by": "role_clean", "groups": ROLES,
+        "context": f'say **"{bn}"** is their biggest bottleneck',
+        "category": "Bottleneck × Role", "chart_title": f'"{bn}" by Role',
+    } for bn in ["Legacy / tech debt", "Lack of leadership", "Poor requirements", "Data quality"]],
+    # 2. Fire-fighting by industry
+    {
+        "metric": "fights_fires", "values": [True],
+        "group_by": "industry", "groups": None,
+        "context": "teams report **fighting fires**",
+        "category": "Fires × Industry", "chart_title": "Fire-fighting rate by Industry",
+    },
+    # 3. Ad-hoc modeling by industry
+    {
+        "metric": "modeling_clean", "values": ["Ad-hoc"],
+        "group_by": "industry", "groups": None,
+        "context": "use **ad-hoc modeling**",
+        "category": "Modeling × Industry", "chart_title": "Ad-hoc modeling by Industry",
+    },
+    # 5. No orchestration by org size
+    {
+        "metric": "orchestration_clean", "values": ["No orchestration / ad-hoc"],
+        "group_by": "org_size", "groups": ORG_SIZES,
+        "context": "have **no orchestration**",
+        "category": "Orchestration × Org Size", "chart_title": "No orchestration rate by Org Size",
+    },
+    # 6. Management self-awareness
+    {
+        "metric": "bottleneck_clean", "values": ["Lack of leadership"],
+        "group_by": "management_vs_non", "groups": ["Management", "Non-Management"],
+        "context": 'cite **"Lack of leadership"** as bottleneck',
+        "category": "Self-awareness", "chart_title": "Leadership bottleneck: Mgmt vs IC",
+    },
+    # 8. AI daily usage by industry
+    {
+        "metric": "ai_usage_frequency", "values": DAILY_AI,
+        "group_by": "industry", "groups": None,
+        "context": "use AI tools **daily or more**",
+        "category": "AI Usage × Industry", "chart_title": "Daily+ AI usage by Industry",
+    },
+    # 10. Fire-fighting by org size
+    {
+        "metric": "fights_fires", "values": [True],
+        "group_by": "org_size", "groups": ORG_SIZES,
+        "context": "teams report **fighting fires**",
+        "category": "Fires × Org Size", "chart_title": "Fire-fighting rate by Org Size",
+    },
+]
+
+
+# ============================================================
+# RATE ENGINE
+# ============================================================
+class RateEngine:
+    """% of each group whose `metric` is one of `values`, for question specs.
+
+    Respondents are counted once per (group_by, metric) pair into a
+    groups × metric-values matrix (np.bincount over packed codes); every spec
+    on that pair, whatever its values, is then read off the matrix.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self._tables = {}
+
+    def table(self, group_by, metric):
+        """(counts, groups, values): respondents per group × metric value.
+
+        The last column counts respondents with a missing `metric`, which
+        are never a hit but are part of the group.
+        """
+        key = (group_by, metric)
+        if key not in self._tables:
+            g_codes, groups = aggregate.factorize(self.frame[group_by])
+            m_codes, values = aggregate.factorize(self.frame[metric])
+            m_codes = np.where(m_codes < 0, len(values), m_codes)
+            keep = g_codes >= 0
+            width = len(values) + 1
+            counts = np.bincount(g_codes[keep].astype(np.int64) * width + m_codes[keep],
+                                 minlength=len(groups) * width).reshape(len(groups), width)
+            self._tables[key] = counts, groups, values
+        return self._tables[key]
+
+    def extend(self, frame):
+        """Add respondents, updating every table built so far from `frame` alone."""
+        delta = RateEngine(frame)
+        for key, (counts, groups, values) in self._tables.items():
+            d_counts, d_groups, d_values = delta.table(*key)
+            all_groups, all_values = groups.union(d_groups), values.union(d_values)
+            merged = np.zeros((len(all_groups), len(all_values) + 1), dtype=np.int64)
+            for c, g, v in ((counts, groups, values), (d_counts, d_groups, d_values)):
+                cols = np.append(all_values.get_indexer(v), len(all_values))
+                merged[np.ix_(all_groups.get_indexer(g), cols)] += c
+            self._tables[key] = merged, all_groups, all_values
+        self.frame = pd.concat([self.frame, frame], ignore_index=True)
+
+    def rates(self, spec):
+        """{group label: rounded %} in the spec's group order."""
+        counts, groups, values = self.table(spec["group_by"], spec["metric"])
+        hit = np.append(values.isin(spec["values"]), False)
+        totals = counts.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct = counts[:, hit].sum(axis=1) / totals * 100
+        labels = spec["groups"]
+        if labels is None:
+            labels = sorted(groups[totals > 0])
+        index = groups.get_indexer(labels)
+        return {label: round(pct[i], 1) if i >= 0 else np.nan
+                for label, i in zip(labels, index)}
+
+
+# ============================================================
+# BUILDERS
+# ============================================================
+class HLBank:
+    """Higher/Lower questions as every ordered pair of each stat's groups.
+
+    Only the stats are stored, one {labels, values, context, category,
+    chart_title} record per spec; question k is decoded from its index on
+    access, and all pairs of a stat share that stat's chart lists.
+    """
+
+    __slots__ = ("stats", "_offsets")
+
+    def __init__(self, stats):
+        self.stats = stats
+        sizes = [len(stat["labels"]) * (len(stat["labels"]) - 1) for stat in stats]
+        self._offsets = np.concatenate([[0], np.cumsum(sizes, dtype=np.int64)])
+
+    def __len__(self):
+        return int(self._offsets[-1])
+
+    def __getitem__(self, k):
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        s = int(np.searchsorted(self._offsets, k, side="right")) - 1
+        stat = self.stats[s]
+        i, j = divmod(int(k - self._offsets[s]), len(stat["labels"]) - 1)
+        j += j >= i
+        return {
+            "anchor_label": stat["labels"][i],
+            "anchor_value": stat["values"][i],
+            "compare_label": stat["labels"][j],
+            "compare_value": stat["values"][j],
+            "context": stat["context"],
+            "category": stat["category"],
+            "chart_labels": stat["labels"],
+            "chart_values": stat["values"],
+            "chart_title": stat["chart_title"],
+        }
+
+    def __iter__(self):
+        return (self[k] for k in range(len(self)))
+
+
+def build_hl_stats(model, specs=None, engine=None):
+    """One stat record per spec: group labels, rates and question text.
+
+    Pass a RateEngine to reuse (or, after extend(), update) its tables.
+    """
+    engine = engine or RateEngine(model.respondents)
+    stats = []
+    for spec in specs or HL_SPECS:
+        rates = engine.rates(spec)
+        stats.append({
+            "labels": list(rates.keys()),
+            "values": list(rates.values()),
+            "context": spec["context"],
+            "category": spec["category"],
+            "chart_title": spec["chart_title"],
+        })
+    return stats
+
+
+def build_hl_questions(model, specs=None):
+    """Build all Higher/Lower questions with chart data embedded."""
+    return HLBank(build_hl_stats(model, specs))
+
+
+def build_guess_questions(model):
+    """Build Guess the Number questions with chart data."""
+    base = model.respondents
+    total = len(base)
+    questions = []
+
+    # Helper to build a distribution dict
+    engine = RateEngine(base)
+
+    def dist(col, val, group_col):
+        return engine.rates({"metric": col, "values": [val], "group_by": group_col, "groups": None})
+
+    questions.append({
+        "question": "What % of data professionals use AI tools **daily or more**?",
+        "answer": round(base["ai_usage_frequency"].isin(["Multiple times per day", "Daily"]).mean() * 100, 1),
+        "hint": "Think about ChatGPT, Copilot, Claude adoption...",
+        "reveal": "AI is table stakes. Only 1% never use AI tools at all.",
+        "category": "AI Adoption",
+        "chart_labels": ["Multiple times/day", "Daily", "Weekly", "Rarely", "Never"],
+        "chart_values": [
+            round((base["ai_usage_frequency"] == f).mean() * 100, 1)
+            for f in config.CATEGORY_ORDER["ai_usage_frequency"]
+        ],
+        "chart_title": "AI Usage Frequency (all respondents)",
+        "highlight": None,
+    })
+
+    questions.append({
+        "question": "What % of respondents report **fighting fires** as a primary focus for the team?",
+        "answer": round(base["fights_fires"].mean() * 100, 1),
+        "hint": "More than 1 in 5, but less than 1 in 2...",
+        "reveal": "Over a quarter of data teams spend significant time firefighting.",
+        "category": "Team Focus",
+        "chart_labels": list(dist("fights_fires", True, "industry").keys()),
+        "chart_values": list(dist("fights_fires", True, "industry").values()),
+        "chart_title": "Fire-fighting rate by Industry",
+        "highlight": None,
+    })
+
+    questions.append({
+        "question": "What % cite **legacy / tech debt** as their #1 bottleneck?",
+        "answer": round((base["bottleneck_clean"] == "Legacy / tech debt").mean() * 100, 1),
+        "hint": "It's the single biggest bottleneck in the survey.",
+        "reveal": "The #1 bottleneck, beating leadership and requirements.",
+        "category": "Challenges",
+        "chart_labels": list(base["bottleneck_clean"].value_counts().head(7).index),
+        "chart_values": [round(v / total * 100, 1) for v in base["bottleneck_clean"].value_counts().head(7).values],
+        "chart_title": "Top bottlenecks (all respondents)",
+        "highlight": "Legacy / tech debt",
+    })
+
+    questions.append({
+        "question": "What % of **10,000+ employee** orgs have **no orchestration**?",
+        "answer": round((base[base["org_size"] == "10,000+"]["orchestration_clean"] == "No orchestration / ad-hoc").mean() * 100, 1),
+        "hint": "Surprisingly close to startup rates...",
+        "reveal": "Enterprise ≠ mature infrastructure. Nearly identical to startups.",
+        "category": "Infrastructure",
+        "chart_labels": ["< 50 emp", "50–199", "200–999", "1K–10K", "10,000+"],
+        "chart_values": [
+            round((base[base["org_size"] == s]["orchestration_clean"] == "No orchestration / ad-hoc").mean() * 100, 1)
+            for s in ORG_SIZES
+        ],
+        "chart_title": "No orchestration rate by Org Size",
+        "highlight": "10,000+",
+    })
+
+    questions.append({
+        "question": "What % of **Healthcare** orgs use **ad-hoc modeling**?",
+        "answer": round((base[base["industry"] == "Healthcare"]["modeling_clean"] == "Ad-hoc").mean() * 100, 1),
+        "hint": "The most regulated industries aren't always the most disciplined...",
+        "reveal": "The most regulated industry has the messiest modeling.",
+        "category": "Modeling",
+        "chart_labels": list(dist("modeling_clean", "Ad-hoc", "industry").keys()),
+        "chart_values": list(dist("modeling_clean", "Ad-hoc", "industry").values()),
+        "chart_title": "Ad-hoc modeling rate by Industry",
+        "highlight": "Healthcare",
+    })
+
+    questions.append({
+        "question": "What % of teams expect to **shrink** in 2026?",
+        "answer": round((base["team_growth_2026"] == "Shrink").mean() * 100, 1),
+        "hint": "The field is generally optimistic...",
+        "reveal": "Cautious optimism. 42% expect growth vs only 7% shrinkage.",
+        "category": "Outlook",
+        "chart_labels": ["Grow", "Stay the same", "Shrink", "Not sure"],
+        "chart_values": [
+            round((base["team_growth_2026"] == g).mean() * 100, 1)
+            for g in config.CATEGORY_ORDER["team_growth_2026"]
+        ],
+        "chart_title": "Team growth expectations 2026",
+        "highlight": "Shrink",
+    })
+
+    questions.append({
+        "question": "What % say **modeling is going well** (no pain points)?",
+        "answer": 11.3,
+        "hint": "Joe Reis called modeling 'in crisis'...",
+        "reveal": "Nearly 90% report at least one modeling pain point.",
+        "category": "Modeling",
+        "chart_labels": list(model.counts(base, "modeling_pain_points").sort_values(ascending=False).index),
+        "chart_values": [round(v / total * 100, 1) for v in model.counts(base, "modeling_pain_points").sort_values(ascending=False).values],
+        "chart_title": "Modeling pain points (multi-select)",
+        "highlight": "None / modeling is going well",
+    })
+
+    questions.append({
+        "question": "What % of **Manufacturing** teams report **fighting fires**?",
+        "answer": round(base[base["industry"] == "Manufacturing / Industrial"]["fights_fires"].mean() * 100, 1),
+        "hint": "Think factories, supply chains, legacy SCADA systems...",
+        "reveal": "Manufacturing and Finance lead in firefighting, far above Tech.",
+        "category": "Industry",
+        "chart_labels": list(dist("fights_fires", True, "industry").keys()),
+        "chart_values": list(dist("fights_fires", True, "industry").values()),
+        "chart_title": "Fire-fighting rate by Industry",
+        "highlight": "Manufacturing / Industrial",
+    })
+
+    questions.append({
+        "question": "What % of teams with **Talent / hiring** as bottleneck expect to **grow**?",
+        "answer": round((base[base["bottleneck_clean"] == "Talent / hiring"]["team_growth_2026"] == "Grow").mean() * 100, 1),
+        "hint": "If your only problem is hiring, things might be going well...",
+        "reveal": "The most bullish group. If talent is your only problem, the future is bright.",
+        "category": "Growth",
+        "chart_labels": list(dist("team_growth_2026", "Grow", "bottleneck_clean").keys()),
+        "chart_values": list(dist("team_growth_2026", "Grow", "bottleneck_clean").values()),
+        "chart_title": "% expecting growth, by bottleneck",
+        "highlight": "Talent / hiring",
+    })
+
+    questions.append({
+        "question": "What % of **Managers/VPs** cite **lack of leadership** as the bottleneck?",
+        "answer": round((base[base["management_vs_non"] == "Management"]["bottleneck_clean"] == "Lack of leadership").mean() * 100, 1),
+        "hint": "Do managers admit they're the problem?",
+        "reveal": "The self-awareness gap is only ~3pp. Managers largely agree.",
+        "category": "Self-awareness",
+        "chart_labels": ["Management", "Non-Management"],
+        "chart_values": [
+            round((base[base["management_vs_non"] == m]["bottleneck_clean"] == "Lack of leadership").mean() * 100, 1)
+            for m in ["Management", "Non-Management"]
+        ],
+        "chart_title": '"Lack of leadership" by Mgmt vs IC',
+        "highlight": "Management",
+    })
+
+    questions.append({
+        "question": "What % of teams building **AI platforms** expect to **shrink**?",
+        "answer": round((base[base["ai_adoption"] == "Building internal AI platforms"]["team_growth_2026"] == "Shrink").mean() * 100, 1),
+        "hint": "AI platforms might be replacing headcount...",
+        "reveal": "Building AI platforms correlates with shrinkage, not growth. The transition costs headcount.",
+        "category": "AI Paradox",
+        "chart_labels": list(base["ai_adoption"].unique()),
+        "chart_values": [
+            round((base[base["ai_adoption"] == ai]["team_growth_2026"] == "Shrink").mean() * 100, 1)
+            for ai in base["ai_adoption"].unique()
+        ],
+        "chart_title": "% expecting shrinkage by AI adoption",
+        "highlight": "Building internal AI platforms",
+    })
+
+    return questions
+
+
+# ============================================================
+# COMPILED BANKS
+# ============================================================
+def compile_banks(model, dataset):
+    """Both question banks, tagged for load_banks().
+
+    The Higher/Lower bank is stored as its stats; wrap them in HLBank. The
+    survey year and respondent count they describe come along for the
+    page text.
+    """
+    years = model.respondents["survey_year"]
+    return {
+        "version": BANK_VERSION,
+        "dataset": dataset,
+        "survey_year": int(years.max()) if len(years) else config.CURRENT_YEAR,
+        "respondents": len(model.respondents),
+        "hl": build_hl_stats(model),
+        "guess": build_guess_questions(model),
+    }
+
+
+def load_banks():
+    """The compiled question banks for the current dataset.
+
+    Reads the pipeline's artifact; only when it is missing or stale (another
+    dataset or BANK_VERSION) does this run the pipeline, and recompile from
+    the model if the pipeline was already up to date.
+    """
+    banks = store.load_questions()
+    if _current(banks):
+        return banks
+    pipeline.build()
+    banks = store.load_questions()
+    if not _current(banks):
+        banks = compile_banks(survey_model.load_model(), pipeline.read_manifest().get("inputs"))
+        store.write_questions(banks)
+    return banks
+
+
+def _current(banks):
+    return (banks is not None and banks.get("version") == BANK_VERSION
+            and banks.get("dataset") == pipeline.read_manifest().get("inputs"))
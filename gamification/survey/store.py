@@ -0,0 +1,288 @@
+"""Columnar storage for the expanded dataset.
+
+The exploded frame repeats every respondent attribute once per multi-select
+combination, so string columns are stored as categoricals (Parquet dictionary
+pages): each distinct value is kept once and rows hold small integer codes.
+Columns listed in config.CATEGORY_ORDER are ordered categoricals in that
+order. Readers ask for the columns they need and skip the rest of the file.
+"""
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from survey import config
+
+
+def ordered_values(col, values):
+    """`values` in the declared order of `col` (config.CATEGORY_ORDER), others after it sorted."""
+    order = config.CATEGORY_ORDER.get(col, [])
+    present = set(values)
+    return [v for v in order if v in present] + sorted(present.difference(order), key=str)
+
+
+def category_dtype(col, values):
+    """Ordered categorical dtype for a CATEGORY_ORDER column holding `values`."""
+    order = config.CATEGORY_ORDER[col]
+    extras = sorted(set(values.dropna()).difference(order), key=str)
+    return pd.CategoricalDtype(order + extras, ordered=True)
+
+
+def to_dictionary_encoded(frame):
+    """Convert every string column to a categorical (dictionary) column.
+
+    CATEGORY_ORDER columns become ordered categoricals in their declared order.
+    """
+    out = frame.copy()
+    for col in out.select_dtypes(include=["object", "string", "category"]).columns:
+        if col in config.CATEGORY_ORDER:
+            out[col] = out[col].astype(category_dtype(col, out[col]))
+        elif not isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype("category")
+    return out
+
+
+def write_parquet(frame, path):
+    """Write a frame with dictionary-encoded string columns."""
+    to_dictionary_encoded(frame).to_parquet(path, index=False)
+
+
+def expanded_path(year=None):
+    return config.model_dir(year) / "expanded.parquet"
+
+
+def load_expanded(columns=None, path=None, year=None):
+    """Read the expanded dataset of a year, optionally only `columns`.
+
+    Categorical dtypes round-trip through the Parquet metadata, so dimension
+    columns come back as pandas categoricals without re-parsing strings.
+    """
+    return pd.read_parquet(path or expanded_path(year), columns=columns)
+
+
+# ============================================================
+# STAR SCHEMA
+# ============================================================
+# Every table lives in its survey year's partition (config.model_dir); a
+# missing `year` means config.CURRENT_YEAR. Respondent ids are positional
+# within a year, so loaders combining years shift them (see id_offsets).
+def respondents_path(year=None):
+    return config.model_dir(year) / "respondents.parquet"
+
+
+def bridge_path(field, year=None):
+    return config.model_dir(year) / f"{field}.parquet"
+
+
+def write_model(respondents, bridges, year=None):
+    """Write the respondent table and the {field: (id, option)} bridge tables.
+
+    Each table is written as Parquet and as a memory-mapped copy (write_mmap).
+    """
+    config.model_dir(year).mkdir(parents=True, exist_ok=True)
+    write_parquet(respondents, respondents_path(year))
+    write_mmap("respondents", respondents, year)
+    for field, bridge in bridges.items():
+        write_parquet(bridge, bridge_path(field, year))
+        write_mmap(field, bridge, year)
+
+
+def load_respondents(columns=None, year=None):
+    """One row per respondent; `columns` should include "id"."""
+    if config.MMAP and mmap_schema_path("respondents", year).exists():
+        return load_mmap("respondents", columns, year)
+    return pd.read_parquet(respondents_path(year), columns=columns)
+
+
+def load_bridge(field, year=None):
+    """(id, option) rows for one multi-select field, unique per pair."""
+    if config.MMAP and mmap_schema_path(field, year).exists():
+        return load_mmap(field, year=year)
+    return pd.read_parquet(bridge_path(field, year))
+
+
+# ============================================================
+# MEMORY-MAPPED TABLES
+# ============================================================
+# A table is one .npy file per column (category codes, or plain values for
+# ids, flags and counts) plus <table>.json with each column's categories.
+# Loading maps the files read-only, so processes on one host share a single
+# page-cache copy and nothing is parsed: a categorical column is its mapped
+# codes array wrapped in the stored dtype.
+def mmap_dir(year=None):
+    return config.model_dir(year) / "mmap"
+
+
+def mmap_schema_path(table, year=None):
+    return mmap_dir(year) / f"{table}.json"
+
+
+def write_mmap(table, frame, year=None):
+    """Write `frame` in the memory-mappable layout (see load_mmap)."""
+    frame = to_dictionary_encoded(frame)
+    mmap_dir(year).mkdir(parents=True, exist_ok=True)
+    schema = {col: _write_mmap_column(table, col, frame[col], year) for col in frame.columns}
+    mmap_schema_path(table, year).write_text(json.dumps(schema, ensure_ascii=False))
+
+
+def write_mmap_partitioned(table, root, year=None):
+    """write_mmap for a table held as Parquet parts (write_partition).
+
+    Columns are read and written one at a time, so only one column of the
+    table is in memory.
+    """
+    parts = sorted((root / table).glob("part-*.parquet"))
+    mmap_dir(year).mkdir(parents=True, exist_ok=True)
+    schema = {}
+    for col in pq.read_schema(parts[0]).names:
+        schema[col] = _write_mmap_column(table, col, load_partitioned(root, table, [col])[col],
+                                         year)
+    mmap_schema_path(table, year).write_text(json.dumps(schema, ensure_ascii=False))
+
+
+def _write_mmap_column(table, col, values, year):
+    """Save one column; returns its schema entry (categories, or None)."""
+    path = mmap_dir(year) / f"{table}.{col}.npy"
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Codes keep the dtype pandas picks for the category count, so
+        # from_codes wraps the mapped array without converting it
+        np.save(path, values.cat.codes.to_numpy())
+        return {"categories": values.cat.categories.tolist(), "ordered": bool(values.cat.ordered)}
+    np.save(path, values.to_numpy())
+    return None
+
+
+def load_mmap(table, columns=None, year=None):
+    """A table written by write_mmap; every column is backed by its read-only mapped file."""
+    root = mmap_dir(year)
+    schema = json.loads(mmap_schema_path(table, year).read_text())
+    out = {}
+    for col in columns or schema:
+        array = np.load(root / f"{table}.{col}.npy", mmap_mode="r")
+        spec = schema[col]
+        out[col] = array if spec is None else pd.Categorical.from_codes(
+            array, dtype=pd.CategoricalDtype(spec["categories"], spec["ordered"])
+        )
+    return pd.DataFrame(out, copy=False)
+
+
+def id_offsets(years):
+    """{year: amount added to its ids} so ids stay unique across `years`.
+
+    Reads only the id column of each partition.
+    """
+    offsets, total = {}, 0
+    for year in years:
+        offsets[year] = total
+        ids = load_respondents(["id"], year)["id"]
+        total += int(ids.max()) + 1 if len(ids) else 0
+    return offsets
+
+
+def cube_path(year=None):
+    return config.model_dir(year) / "cube.pkl"
+
+
+def write_cube(cube, year=None):
+    """Pickle the {frozenset(dims): counts} cube (see survey.cube)."""
+    pd.to_pickle(cube, cube_path(year))
+
+
+def load_cube(year=None):
+    return pd.read_pickle(cube_path(year))
+
+
+def questions_path(year=None):
+    return config.model_dir(year) / "questions.json.gz"
+
+
+def write_questions(banks, year=None):
+    """Gzipped JSON of the compiled Game question banks (see survey.questions)."""
+    with gzip.open(questions_path(year), "wt", encoding="utf-8") as f:
+        json.dump(banks, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_questions(year=None):
+    """The compiled question banks, or None if they were never written."""
+    if not questions_path(year).exists():
+        return None
+    with gzip.open(questions_path(year), "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ============================================================
+# BATCHED OUTPUT (survey.ingest)
+# ============================================================
+def partition_path(root, table, part):
+    """<root>/<table>/part-<part>.parquet"""
+    return root / table / f"part-{part:05d}.parquet"
+
+
+def write_partition(frame, root, table, part):
+    path = partition_path(root, table, part)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_parquet(frame, path)
+    return path
+
+
+def load_partitioned(root, table, columns=None):
+    """Every part of a partitioned table, concatenated in part order.
+
+    Parts have their own category dictionaries; pandas falls back to plain
+    strings where they differ, and those columns are re-encoded.
+    """
+    parts = sorted((root / table).glob("part-*.parquet"))
+    if not parts:
+        raise FileNotFoundError(f"no partitions under {root / table}")
+    frames = [pd.read_parquet(path, columns=columns) for path in parts]
+    return to_dictionary_encoded(pd.concat(frames, ignore_index=True))
+
+
+class ParquetBatches:
+    """One Parquet file written a row group per batch.
+
+    String and categorical columns are stored as dictionaries with int32
+    indices, so batches with different categories share the file's schema
+    (fixed by the first batch); readers get categoricals back.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        if self.writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.writer = pq.ParquetWriter(self.path, _arrow_schema(frame))
+        self.writer.write_table(pa.Table.from_pandas(frame, schema=self.writer.schema,
+                                                     preserve_index=False))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def write_parquet_batches(frame, path, rows=100_000):
+    """Write `frame` (e.g. a memory-mapped table) `rows` at a time."""
+    batches = ParquetBatches(path)
+    try:
+        for start in range(0, len(frame), rows):
+            batches.write(frame.iloc[start:start + rows])
+    finally:
+        batches.close()
+
+
+def _arrow_schema(frame):
+    fields = []
+    for col, dtype in frame.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            kind = pa.dictionary(pa.int32(), pa.string(), ordered=bool(dtype.ordered))
+        elif pd.api.types.is_string_dtype(dtype) or dtype == object:
+            kind = pa.dictionary(pa.int32(), pa.string())
+        else:
+            kind = pa.from_numpy_dtype(dtype)
+        fields.append(pa.field(col, kind))
+    return pa.schema(fields)
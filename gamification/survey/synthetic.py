@@ -0,0 +1,182 @@
+"""Synthetic survey generator for scale testing.
+
+Learns the distribution of the raw survey CSV and writes arbitrarily large
+surveys in the same schema, in chunks, so the pipeline, Explorer and Game can
+be load-tested far beyond the real 1,101 respondents.
+
+The model is a Chow-Liu tree: every column is a node, the tree is the
+maximum spanning tree over pairwise mutual information, and each column is
+sampled from P(column | parent). That reproduces every marginal and the
+strongest pairwise dependencies (role × bottleneck, AI usage × adoption,
+...). Multi-select fields are modelled on the whole answer, so the options
+chosen together and the number of options per respondent follow the real
+survey. Conditionals are smoothed toward the marginal so rare combinations
+are not simply copied; values (freetext included) are always ones seen in
+the real data.
+
+    python -m survey.synthetic 1000000 --out data/synthetic/survey_1m.csv
+
+Memory is bounded by --chunk-size rows, whatever the total.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from survey import config, pipeline
+
+# Synthesized separately (uniform over the observed period), not in the tree
+TIMESTAMP = "timestamp"
+
+
+def mutual_information(a, b, ka, kb):
+    """Mutual information (nats) between two integer-coded columns.
+
+    Bias-corrected (Miller-Madow): the plug-in estimate is inflated by about
+    (ka - 1)(kb - 1) / 2n, which would otherwise make high-cardinality
+    freetext columns look dependent on everything.
+    """
+    joint = np.bincount(a * kb + b, minlength=ka * kb).reshape(ka, kb) / len(a)
+    pa, pb = joint.sum(axis=1), joint.sum(axis=0)
+    nz = joint > 0
+    mi = float((joint[nz] * np.log(joint[nz] / np.outer(pa, pb)[nz])).sum())
+    return mi - (ka - 1) * (kb - 1) / (2 * len(a))
+
+
+def chow_liu_tree(codes, sizes):
+    """({child: parent}, sampling order) of the maximum-MI spanning tree, rooted at node 0."""
+    n = codes.shape[1]
+    mi = np.zeros((n, n))
+    for i in range(n):
+        for j in range(i + 1, n):
+            mi[i, j] = mi[j, i] = mutual_information(codes[:, i], codes[:, j], sizes[i], sizes[j])
+    # Prim's algorithm; `best` is -inf for nodes already in the tree
+    parents, order = {}, [0]
+    best, link = mi[0].copy(), np.zeros(n, dtype=int)
+    best[0] = -np.inf
+    for _ in range(n - 1):
+        child = int(np.argmax(best))
+        parents[child] = int(link[child])
+        order.append(child)
+        best[child] = -np.inf
+        better = (mi[child] > best) & (best > -np.inf)
+        best[better] = mi[child][better]
+        link[better] = child
+    return parents, order
+
+
+class SurveySynthesizer:
+    """Chow-Liu model of the raw survey; see the module docstring."""
+
+    def __init__(self, columns, values, parents, order, cdfs, period):
+        self.columns = columns      # raw CSV column order
+        self.values = values        # {column: observed values, by code}
+        self.parents = parents      # {column: parent column}
+        self.order = order          # sampling order (parents first)
+        self.cdfs = cdfs            # {column: cumulative P(column | parent) rows}
+        self.period = period        # (first, last) timestamp, ms since epoch
+
+    @classmethod
+    def fit(cls, raw, alpha=1.0):
+        """Learn from a raw survey frame (as read from the CSV).
+
+        `alpha` is the smoothing weight, in pseudo-respondents, pulling each
+        conditional toward the column's marginal.
+        """
+        raw = raw.drop(columns=["id"], errors="ignore")
+        nodes = [col for col in raw.columns if col != TIMESTAMP]
+        values, codes = {}, []
+        for col in nodes:
+            # Missing answers are a value of their own
+            col_codes, uniques = pd.factorize(raw[col], use_na_sentinel=False)
+            values[col] = np.asarray(uniques, dtype=object)
+            codes.append(col_codes.astype(np.int64))
+        codes = np.column_stack(codes)
+        sizes = [len(values[col]) for col in nodes]
+
+        tree, order = chow_liu_tree(codes, sizes)
+        cdfs = {}
+        for node in order:
+            marginal = np.bincount(codes[:, node], minlength=sizes[node]) / len(codes)
+            if node not in tree:
+                cdfs[nodes[node]] = np.cumsum(marginal)[None, :]
+                continue
+            parent = tree[node]
+            counts = np.bincount(codes[:, parent] * sizes[node] + codes[:, node],
+                                 minlength=sizes[parent] * sizes[node]).reshape(sizes[parent], -1)
+            conditional = (counts + alpha * marginal) / (counts.sum(axis=1, keepdims=True) + alpha)
+            cdfs[nodes[node]] = np.cumsum(conditional, axis=1)
+
+        period = None
+        if TIMESTAMP in raw:
+            stamps = pd.to_datetime(raw[TIMESTAMP])
+            period = tuple(int(t.value // 1_000_000) for t in (stamps.min(), stamps.max()))
+        parents = {nodes[child]: nodes[parent] for child, parent in tree.items()}
+        return cls(list(raw.columns), values, parents, [nodes[i] for i in order], cdfs, period)
+
+    # ------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------
+    def _draw(self, col, parent_codes, n, rng):
+        """`n` codes of `col`, given its parent's codes (None for the root)."""
+        cdf = self.cdfs[col]
+        n_values = cdf.shape[1]
+        u = rng.random(n)
+        if parent_codes is None:
+            return np.minimum(np.searchsorted(cdf[0], u, side="right"), n_values - 1)
+        # Group rows by parent value and invert that value's CDF
+        out = np.empty(n, dtype=np.int64)
+        by_parent = np.argsort(parent_codes, kind="stable")
+        bounds = np.cumsum(np.bincount(parent_codes, minlength=len(cdf)))
+        start = 0
+        for p, stop in enumerate(bounds):
+            rows = by_parent[start:stop]
+            out[rows] = np.searchsorted(cdf[p], u[rows], side="right")
+            start = stop
+        return np.minimum(out, n_values - 1)
+
+    def sample(self, n, rng=None):
+        """A frame of `n` synthetic respondents in the raw CSV schema."""
+        rng = rng if rng is not None else np.random.default_rng()
+        codes = {}
+        for col in self.order:
+            parent = self.parents.get(col)
+            codes[col] = self._draw(col, codes[parent] if parent else None, n, rng)
+
+        out = {col: self.values[col][codes[col]] for col in self.order}
+        if self.period is not None:
+            ms = rng.integers(self.period[0], self.period[1] + 1, n).astype("datetime64[ms]")
+            out[TIMESTAMP] = np.char.replace(np.datetime_as_string(ms, unit="ms"), "T", " ")
+        return pd.DataFrame({col: out[col] for col in self.columns})
+
+    def generate(self, n, path, chunk_size=100_000, seed=0):
+        """Write `n` respondents to a CSV at `path`, `chunk_size` rows at a time."""
+        rng = np.random.default_rng(seed)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            for start in range(0, n, chunk_size):
+                chunk = self.sample(min(chunk_size, n - start), rng)
+                chunk.to_csv(f, header=start == 0, index=False)
+        return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic survey CSV.")
+    parser.add_argument("rows", type=int, help="number of respondents")
+    parser.add_argument("--out", type=Path, default=None,
+                        help="output CSV (default: data/synthetic/survey_<rows>.csv)")
+    parser.add_argument("--source", type=Path, default=None,
+                        help="survey CSV to learn from (default: the real survey)")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    synthesizer = SurveySynthesizer.fit(pipeline.load_raw(args.source))
+    out = args.out or config.DATA_DIR / "synthetic" / f"survey_{args.rows}.csv"
+    synthesizer.generate(args.rows, out, args.chunk_size, args.seed)
+    print(f"Wrote {args.rows:,} respondents to {out}")
+
+
+if __name__ == "__main__":
+    main()
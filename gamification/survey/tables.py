@@ -0,0 +1,99 @@
+"""Explorer result tables, built from a query engine.
+
+The data half of the Explorer's charts: each function takes an engine (see
+survey.cube.CubeEngine / survey.duckdb_engine.DuckDBEngine) and a source
+(sidebar selections or a cohort from engine.split()) and returns the frame
+the page plots, so these paths run outside Streamlit too. Ordinal dimensions
+(config.CATEGORY_ORDER) always come out in their declared order.
+"""
+import pandas as pd
+
+from survey import config, store
+
+
+def distribution(engine, source, group_col, sort=True, top_n=None):
+    """Distinct respondents per group, with % of the source.
+
+    `sort` orders groups by respondents, except for ordinal dimensions.
+    """
+    result = engine.counts(source, group_col).reset_index()
+    result.columns = [group_col, "respondents"]
+    result["pct"] = (result["respondents"] / engine.size(source) * 100).round(1)
+    if group_col in config.CATEGORY_ORDER:
+        result = result.set_index(group_col, drop=False).loc[
+            store.ordered_values(group_col, result[group_col])
+        ].reset_index(drop=True)
+    elif sort:
+        result = result.sort_values("respondents", ascending=False)
+    if top_n:
+        result = result.head(top_n)
+    return result
+
+
+def comparison(engine, source, group_col, compare_col):
+    """Respondents per (compare_col, group_col), with % of each compare_col value."""
+    ct = engine.pair_counts(source, compare_col, group_col).reset_index()
+    ct.columns = [compare_col, group_col, "respondents"]
+    totals = engine.counts(source, compare_col).reset_index()
+    totals.columns = [compare_col, "total"]
+    ct = ct.merge(totals, on=compare_col)
+    ct["pct"] = (ct["respondents"] / ct["total"] * 100).round(1)
+    return ct
+
+
+def crosstab(engine, source, row_dim, col_dim, show_as="Count"):
+    """row_dim × col_dim pivot of distinct respondents ("Count", "Row %" or "Column %")."""
+    ct = engine.pair_counts(source, row_dim, col_dim).reset_index()
+    ct.columns = [row_dim, col_dim, "count"]
+    pivot = _in_order(ct.pivot_table(index=row_dim, columns=col_dim, values="count",
+                                     fill_value=0, observed=True))
+
+    if show_as == "Row %":
+        pivot = pivot.div(pivot.sum(axis=1), axis=0).multiply(100).round(1)
+    elif show_as == "Column %":
+        pivot = pivot.div(pivot.sum(axis=0), axis=1).multiply(100).round(1)
+    return pivot
+
+
+def year_over_year(engine, source, dim):
+    """% of each survey year's respondents per value of `dim` (years as columns).
+
+    With two or more years a "Δ pp" column holds the change from the
+    previous year to the latest.
+    """
+    ct = engine.pair_counts(source, dim, "survey_year").reset_index()
+    ct.columns = [dim, "survey_year", "count"]
+    pivot = _in_order(ct.pivot_table(index=dim, columns="survey_year", values="count",
+                                     fill_value=0, observed=True))
+    totals = engine.counts(source, "survey_year")
+    pivot = pivot.div(totals.reindex(pivot.columns), axis=1).multiply(100).round(1)
+    if pivot.shape[1] >= 2:
+        pivot["Δ pp"] = (pivot.iloc[:, -1] - pivot.iloc[:, -2]).round(1)
+    return pivot
+
+
+def cohort_comparison(engine, source, cohorts, dim):
+    """Respondents per value of `dim` in each cohort, with % of the cohort.
+
+    Long format (cohort, dim, respondents, size, pct), cohorts in the given
+    order and values in engine order; values no cohort has are dropped.
+    """
+    columns = ["cohort", dim, "respondents", "size", "pct"]
+    if not cohorts:
+        return pd.DataFrame(columns=columns)
+    wide = engine.compare(source, cohorts, dim)
+    sizes, wide = wide["respondents"], wide.drop(columns="respondents")
+    wide = wide.loc[:, wide.sum() > 0]
+    result = wide.rename_axis("cohort").rename_axis(dim, axis=1).stack().rename("respondents")
+    result = result.reset_index()
+    result["size"] = result["cohort"].map(sizes)
+    result["pct"] = (result["respondents"] / result["size"].where(result["size"] > 0) * 100).round(1)
+    return result[columns]
+
+
+def _in_order(pivot):
+    """Pivot with ordinal row/column labels in their declared order."""
+    return pivot.reindex(
+        index=store.ordered_values(pivot.index.name, pivot.index),
+        columns=store.ordered_values(pivot.columns.name, pivot.columns),
+    )
@@ -0,0 +1,69 @@
+"""Shared fixtures; makes the app's `survey` package importable as in benchmarks/."""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "gamification"))
+
+from survey import config, pipeline  # noqa: E402
+from survey.bitmap import BitmapIndex  # noqa: E402
+from survey.cache import CachedEngine  # noqa: E402
+from survey.cube import CubeEngine  # noqa: E402
+from survey.model import SurveyModel  # noqa: E402
+
+
+@pytest.fixture
+def engine():
+    respondents = pd.DataFrame({
+        "id": range(8),
+        "region": ["EU", "EU", "NA", "NA", "EU", "APAC", "NA", "EU"],
+        "org_size": ["small", "large", "large", "small", "small", "large", "small", "large"],
+    })
+    bridges = {"team_focus": pd.DataFrame({
+        "id": [0, 0, 1, 2, 2, 3, 5, 6, 7, 7],
+        "team_focus": ["fires", "ml", "fires", "fires", "bi", "ml", "fires", "bi", "fires", "ml"],
+    })}
+    model = SurveyModel(respondents, bridges)
+    index = BitmapIndex.from_model(model, ["region", "org_size", "team_focus"])
+    return CachedEngine(CubeEngine(model, index, {}))
+
+
+@pytest.fixture
+def selections(engine):
+    return {"region": engine.values("region")}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Pipeline outputs and stage caches under tmp_path; mappings stay in data/."""
+    monkeypatch.setattr(config, "BUILD_DIR", tmp_path / "build")
+    monkeypatch.setattr(config, "MODEL_DIR", tmp_path / "model")
+    pipeline._compiled.cache_clear()  # fuzzy decision caches live under BUILD_DIR
+    yield tmp_path
+    pipeline._compiled.cache_clear()
+
+
+@pytest.fixture
+def raw_csv(data_dir):
+    """The first 60 real responses, as a raw survey file."""
+    path = data_dir / "survey_2026_data_engineering.csv"
+    pd.read_csv(config.DATA_DIR / "survey_2026_data_engineering.csv", nrows=60).to_csv(
+        path, index=False)
+    return path
+
+
+@pytest.fixture
+def normalized(monkeypatch):
+    """Ids of the rows each pipeline.normalize call receives, per call."""
+    calls = []
+    normalize = pipeline.normalize
+
+    def spy(raw, year=None):
+        calls.append(raw["id"].tolist())
+        return normalize(raw, year)
+
+    monkeypatch.setattr(pipeline, "normalize", spy)
+    return calls
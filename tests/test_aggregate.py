@@ -0,0 +1,60 @@
+"""survey.aggregate kernels against the groupby(...)["id"].nunique() oracle."""
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from survey import aggregate
+
+
+@pytest.fixture
+def rows():
+    """Exploded-style rows: repeated (id, value) pairs and missing values."""
+    rng = np.random.default_rng(0)
+    n = 2000
+    frame = pd.DataFrame({
+        "id": rng.integers(0, 300, n),
+        "role": rng.choice(["DE", "AE", "Manager", None], n),
+        "size": pd.Categorical(rng.choice(["small", "large", "mid"], n),
+                               categories=["small", "mid", "large", "unused"]),
+        "focus": rng.choice(["ingest", "model", "fires", np.nan], n),
+    })
+    # Duplicate a block of rows outright, as explode() does
+    return pd.concat([frame, frame.iloc[:500]], ignore_index=True)
+
+
+def oracle(frame, cols):
+    return frame.groupby(cols, observed=True)["id"].nunique()
+
+
+def check(result, expected):
+    tm.assert_series_equal(result, expected, check_names=False, check_dtype=False,
+                           check_index_type=False, check_categorical=False)
+
+
+@pytest.mark.parametrize("col", ["role", "size", "focus"])
+def test_distinct_count(rows, col):
+    check(aggregate.distinct_count(rows["id"], rows[col]), oracle(rows, col))
+
+
+def test_distinct_count_2d(rows):
+    check(aggregate.distinct_count_2d(rows["id"], rows["role"], rows["size"]),
+          oracle(rows, ["role", "size"]))
+
+
+def test_distinct_count_nd(rows):
+    cols = ["role", "size", "focus"]
+    check(aggregate.distinct_count_nd(rows["id"], [rows[c] for c in cols]), oracle(rows, cols))
+
+
+def test_filtered_subset(rows):
+    subset = rows[(rows["size"] == "large") & rows["id"].between(50, 200)]
+    check(aggregate.distinct_count(subset["id"], subset["role"]), oracle(subset, "role"))
+    check(aggregate.distinct_count_2d(subset["id"], subset["role"], subset["focus"]),
+          oracle(subset, ["role", "focus"]))
+
+
+def test_unique_rows_skip_dedupe(rows):
+    distinct = rows.drop_duplicates(["id", "role"])
+    check(aggregate.distinct_count(distinct["id"], distinct["role"], unique=True),
+          oracle(distinct, "role"))
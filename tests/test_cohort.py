@@ -0,0 +1,52 @@
+"""Cohort expressions through the cached pandas engine."""
+import pytest
+
+from survey import api, cohort, config, tables
+
+
+def test_compare_twice_through_cache(engine, selections):
+    selected = cohort.parse('team_focus = "fires"')
+    cohorts = [selected.named("In cohort"), (~selected).named("Rest")]
+
+    first = engine.compare(selections, cohorts, "org_size")
+    table = tables.cohort_comparison(engine, selections, cohorts, "org_size")
+    second = engine.compare(selections, cohorts, "org_size")
+
+    assert second is first
+    assert list(second["respondents"]) == [5, 3]
+    assert list(second.columns) == ["respondents", "large", "small"]
+    assert table.set_index(["cohort", "org_size"])["respondents"].to_dict() == {
+        ("In cohort", "large"): 4, ("In cohort", "small"): 1,
+        ("Rest", "large"): 0, ("Rest", "small"): 3,
+    }
+
+
+def test_named_returns_a_copy():
+    selected = cohort.parse('team_focus = "fires" and not region = "EU"')
+    renamed = selected.named("label")
+    assert selected.label is None and selected.name == str(selected)
+    assert renamed.name == "label" and str(renamed) == str(selected)
+
+
+def test_split_matches_compare(engine, selections):
+    selected = cohort.parse('team_focus in ("ml", "bi") or org_size = "small"')
+    has, rest = engine.split(selections, selected)
+    sizes = engine.compare(selections, [selected, ~selected], "region")["respondents"]
+    assert [engine.size(has), engine.size(rest)] == list(sizes)
+
+
+@pytest.mark.parametrize("k", [0, -1, 4])
+def test_combinations_reject_k_out_of_range(k):
+    with pytest.raises(ValueError, match="k must be between 1 and 3"):
+        cohort.combinations("team_focus", ["fires", "ml", "bi"], k)
+
+
+def test_cohorts_endpoint_rejects_k_below_one(engine, selections, monkeypatch):
+    testclient = pytest.importorskip("starlette.testclient")
+    monkeypatch.setattr(api, "_request_state", lambda params: (engine, selections))
+    client = testclient.TestClient(api.create_app())
+    options = len(config.MULTI_SELECT_OPTIONS["team_focus"])
+    for k in [0, options + 1]:
+        response = client.get(f"/cohorts/org_size?field=team_focus&k={k}")
+        assert response.status_code == 400 and "k must be" in response.json()["error"]
+    assert client.get("/cohorts/org_size?field=team_focus&k=1").status_code == 200
@@ -0,0 +1,30 @@
+"""DuckDB views over the year partitions against the pandas engine."""
+import pytest
+
+from survey import config, ingest
+from survey.live import LiveSurvey
+
+duckdb_engine = pytest.importorskip("survey.duckdb_engine")
+pytest.importorskip("duckdb")
+
+
+@pytest.fixture
+def partitions(raw_csv):
+    for year in (2029, 2030):
+        ingest.ingest(raw_csv, year, explode=False)
+    return [2029, 2030]
+
+
+def test_views_read_the_selected_partitions(partitions):
+    engine = duckdb_engine.DuckDBEngine.connect(years=[2030])
+    assert engine.total() == 60 and engine.values("survey_year") == [2030]
+
+    both = duckdb_engine.DuckDBEngine.connect(years=partitions)
+    pandas = LiveSurvey.load(years=partitions).engine
+    assert both.total() == 120
+    assert both.values("survey_year") == partitions
+    assert both.size({"survey_year": [2029]}) == 60
+    for dim in ["org_size", "team_focus", "survey_year"]:
+        assert both.counts({}, dim).to_dict() == pandas.counts({}, dim).to_dict(), dim
+    # Nothing is written next to the pipeline output
+    assert not list(config.MODEL_DIR.parent.glob("*.duckdb"))
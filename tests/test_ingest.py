@@ -0,0 +1,44 @@
+"""Chunked ingestion into a year partition, read back by the regular loaders."""
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from survey import config, cube, ingest, model, pipeline, store
+from survey.live import LiveSurvey
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_ingested_partition_loads_as_built(raw_csv, monkeypatch, mmap):
+    manifest = ingest.ingest(raw_csv, 2026, chunk_size=25)
+    assert (manifest["parts"], manifest["respondents"]) == (3, 60)
+
+    monkeypatch.setattr(config, "MMAP", mmap)
+    loaded = model.load_model(years=[2026])
+    table, bridges = pipeline.split_model(pipeline.normalize(pipeline.load_raw(raw_csv), 2026))
+    # copy(): memory-mapped columns compare by value
+    tm.assert_frame_equal(loaded.respondents.copy(), store.to_dictionary_encoded(table))
+    for field, bridge in bridges.items():
+        tm.assert_frame_equal(loaded.bridges[field].copy(), store.to_dictionary_encoded(bridge))
+
+    stored, built = store.load_cube(2026), cube.build_cube(loaded)
+    assert stored.keys() == built.keys()
+    for key, counts in built.items():
+        tm.assert_series_equal(stored[key], counts)
+    assert len(store.load_expanded(year=2026)) == manifest["rows"]
+
+
+def test_build_keeps_ingested_partition(raw_csv, normalized):
+    ingest.ingest(raw_csv, 2030, chunk_size=25)
+    del normalized[:]
+
+    pipeline.build(year=2030)
+    assert normalized == []
+    live = LiveSurvey.load(years=[2030])
+    assert live.engine.total() == 60
+    assert live.engine.values("survey_year") == [2030]
+
+    raw = pd.read_csv(raw_csv)
+    raw.loc[0, "role"] = "Data Engineer"
+    raw.to_csv(raw_csv, index=False)
+    pipeline.build(year=2030)
+    assert [len(ids) for ids in normalized] == [25, 25, 10]
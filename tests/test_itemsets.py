@@ -0,0 +1,16 @@
+"""Itemset prevalence through the cached pandas engine."""
+import pandas as pd
+
+from survey import itemsets
+
+
+def test_prevalence_with_segment_filtered_out(engine):
+    found = pd.DataFrame({
+        "itemset": ["fires + ml"],
+        "items": [(("team_focus", "fires"), ("team_focus", "ml"))],
+        "support": [40.0],
+    })
+    result = itemsets.prevalence(engine, {"region": ["EU"]}, found, "region")
+    # respondents 0 and 7: both EU, the only region the selection keeps
+    assert result[["region", "respondents", "segment_size", "pct"]].values.tolist() == [
+        ["EU", 2, 4, 50.0]]
@@ -0,0 +1,61 @@
+"""Appends to a served survey: counts, index and every cache downstream."""
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from survey import api, config, cube, data, ingest, store
+from survey.bitmap import BitmapIndex, index_columns
+from survey.live import LiveSurvey
+
+
+@pytest.fixture
+def served(raw_csv, monkeypatch):
+    """The first 40 responses as the current year's partition; returns the other 20."""
+    raw = pd.read_csv(raw_csv)
+    first = raw_csv.with_name("first.csv")
+    raw.iloc[:40].to_csv(first, index=False)
+    ingest.ingest(first, config.CURRENT_YEAR, explode=False)
+    for name, value in [("_resources", {}), ("_appended", []), ("_listeners", [])]:
+        monkeypatch.setattr(data, name, value)
+    return raw.iloc[40:]
+
+
+def test_append_matches_a_rebuild(served):
+    live = LiveSurvey.load()
+    live.append(served.iloc[:1])
+    ids = live.append(served.iloc[1:])
+    assert list(ids) == list(range(41, 60))
+
+    built = cube.build_cube(live.model)
+    assert live.cube.keys() == built.keys()
+    for key, counts in built.items():
+        tm.assert_series_equal(live.cube[key], counts, check_index_type=False)
+    # Declared order survives the merge, not alphabetical
+    org_size = live.cube[frozenset(["org_size"])].index
+    assert list(org_size) == store.ordered_values("org_size", org_size)
+
+    rebuilt = BitmapIndex.from_model(live.model, index_columns(live.model))
+    assert live.index.n == 60 and live.index.complete == rebuilt.complete
+    for col, bitmaps in rebuilt.bitmaps.items():
+        assert live.index.values(col) == rebuilt.values(col)
+        for value, bits in bitmaps.items():
+            assert (live.index.bitmaps[col][value] == bits).all(), (col, value)
+
+
+def test_data_append_refreshes_shared_resources(served):
+    testclient = pytest.importorskip("starlette.testclient")
+    client = testclient.TestClient(api.create_app())
+    region = served["region"].mode()[0]
+    rows = served[served["region"] == region].iloc[:2]
+    other = next(r for r in data.survey().engine.values("region") if r != region)
+    urls = ["/size", f"/size?region={region}", f"/size?region={other}"]
+    before = [client.get(url).json() for url in urls]
+    hl_bank, banks = data.hl_bank(), data.banks()
+
+    data.append(rows)
+    hits = client.get("/health").json()["hits"]
+    assert [client.get(url).json() for url in urls] == [before[0] + 2, before[1] + 2, before[2]]
+    # Only the response whose filters exclude the new rows was still cached
+    assert client.get("/health").json()["hits"] == hits + 1
+    assert data.hl_bank() is not hl_bank and data.banks() is not banks
+    assert len(data.survey().model.respondents) == 42
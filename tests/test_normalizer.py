@@ -0,0 +1,98 @@
+"""Freetext mapping rules: exact, contains and regex matches, fuzzy matching, the fallback."""
+import pandas as pd
+import pytest
+
+from survey import config, pipeline
+from survey.normalizer import FreetextNormalizer, FuzzyMatcher
+
+
+@pytest.fixture
+def rules(tmp_path):
+    path = tmp_path / "mapping.csv"
+    path.write_text(
+        "Original_Response,Category,Match\n"
+        "Airflow and Dagster,Other\n"
+        "Airflow,Airflow\n"
+        "airflow,Airflow,contains\n"
+        "dagster,Dagster,contains\n"
+        "apache airflow,Managed Airflow,contains\n"
+        r"\bcron(tab|jobs?)?\b,Cron,regex" "\n"
+        r"^step ?functions?$,Step Functions,regex" "\n"
+    )
+    return path
+
+
+def normalize(path, values, default="Other"):
+    series = pd.Series(values, dtype=object)
+    return FreetextNormalizer.from_csv(path, default)(series).tolist()
+
+
+def test_exact_rule_wins_over_keywords(rules):
+    # "Airflow and Dagster" contains both keywords but is listed exactly
+    assert normalize(rules, ["Airflow and Dagster", " Airflow "]) == ["Other", "Airflow"]
+
+
+def test_keywords_ignore_case_leftmost_then_longest(rules):
+    assert normalize(rules, ["We run AIRFLOW", "Dagster, then airflow",
+                             "Apache Airflow 2"]) == ["Airflow", "Dagster", "Managed Airflow"]
+
+
+def test_regex_rules(rules):
+    assert normalize(rules, ["Crontab on a VM", "CRON", "cronjobs", "Chronos",
+                             "Step Functions", "step functions + lambda"]) == [
+        "Cron", "Cron", "Cron", "Other", "Step Functions", "Other"]
+
+
+def test_unmatched_and_missing_fall_back_to_default(rules):
+    assert normalize(rules, ["Luigi", None, float("nan")]) == ["Other"] * 3
+    assert normalize(rules, ["Luigi", None], default=None) == [None, None]
+
+
+def test_invalid_rules_are_rejected(tmp_path):
+    path = tmp_path / "mapping.csv"
+    path.write_text("Original_Response,Category,Match\nairflow,Airflow,fuzzy\n")
+    with pytest.raises(ValueError, match="unknown Match"):
+        FreetextNormalizer.from_csv(path)
+    path.write_text("Original_Response,Category,Match\ncron(,Cron,regex\n")
+    with pytest.raises(ValueError, match="invalid regex"):
+        FreetextNormalizer.from_csv(path)
+
+
+def test_shipped_keyword_rules():
+    normalizer = FreetextNormalizer.from_csv(config.DATA_DIR / "survey_orchestration_mapping.csv")
+    assert normalizer.keywords and normalizer.patterns
+    assert [normalizer.lookup(v) for v in ["BMC Control M", "crontab on EC2",
+                                           "Prefect Cloud", "Airflow and Dagster"]] == [
+        "Control-M", "Cron/Schedulers", "Prefect", "Other"]
+
+
+@pytest.fixture
+def fuzzy(tmp_path):
+    normalizer = FreetextNormalizer({
+        "Snowflake": "Cloud Data Warehouse",
+        "Databricks Lakehouse": "Lakehouse",
+        "Amazon S3 data lake": "Data Lake",
+        "On-premise Postgres": "On-prem",
+    })
+    normalizer.fuzzy = FuzzyMatcher.from_rules(
+        normalizer.exact, min_score=pipeline.FUZZY_MIN_SCORE,
+        cache_path=tmp_path / "mapping_fuzzy.json",
+    )
+    return normalizer
+
+
+def test_fuzzy_maps_typos_and_reordered_words(fuzzy):
+    values = ["Snowflak", "Databricks Lakehuose", "postgres on-premise", "data lake Amazon S3"]
+    assert fuzzy(pd.Series(values)).tolist() == [
+        "Cloud Data Warehouse", "Lakehouse", "On-prem", "Data Lake"]
+    assert all(score >= pipeline.FUZZY_MIN_SCORE for _, _, score in fuzzy.fuzzy.decisions.values())
+
+
+def test_fuzzy_below_threshold_falls_back_to_default(fuzzy, tmp_path):
+    assert fuzzy(pd.Series(["Excel spreadsheets", "Snowflake"])).tolist() == [
+        "Other", "Cloud Data Warehouse"]
+    category, _, score = fuzzy.fuzzy.decisions["Excel spreadsheets"]
+    assert category is None and score < pipeline.FUZZY_MIN_SCORE
+    # The low-confidence decision is persisted and listed for review
+    review = pd.read_csv(tmp_path / "mapping_fuzzy_review.csv")
+    assert review["value"].iloc[0] == "Excel spreadsheets"
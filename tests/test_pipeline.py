@@ -0,0 +1,36 @@
+"""Content-hashed build: manifest skip and the per-row stage cache."""
+import pandas as pd
+
+from survey import pipeline, store
+
+
+def test_unchanged_input_skips_build(raw_csv, normalized):
+    output = pipeline.build(raw_path=raw_csv, year=2026)
+    assert normalized == [list(range(60))]
+    written = output.stat().st_mtime_ns
+
+    assert pipeline.build(raw_path=raw_csv, year=2026) == output
+    assert normalized == [list(range(60))]
+    assert output.stat().st_mtime_ns == written
+    assert pipeline.read_manifest(2026)["respondents"] == 60
+
+
+def test_edited_row_is_the_only_one_renormalized(raw_csv, normalized):
+    pipeline.build(raw_path=raw_csv, year=2026)
+    raw = pd.read_csv(raw_csv)
+    raw.loc[7, "role"] = "Data Engineer"
+    raw.to_csv(raw_csv, index=False)
+
+    pipeline.build(raw_path=raw_csv, year=2026)
+    assert normalized[1:] == [[7]]
+    table = store.load_respondents(["id", "role_clean"], 2026)
+    assert len(table) == 60
+    assert table.loc[table["id"] == 7, "role_clean"].item() == "Data Engineer"
+
+
+def test_pipeline_version_invalidates_cache(raw_csv, normalized, monkeypatch):
+    pipeline.build(raw_path=raw_csv, year=2026)
+    monkeypatch.setattr(pipeline, "PIPELINE_VERSION", pipeline.PIPELINE_VERSION + 1)
+
+    pipeline.build(raw_path=raw_csv, year=2026)
+    assert normalized == [list(range(60)), list(range(60))]
@@ -0,0 +1,34 @@
+"""Star-schema storage: the memory-mapped layout against the Parquet files."""
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+
+from survey import config, model, pipeline, store
+
+
+def _memmap(array):
+    """The np.memmap an array is a view of, or None."""
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array
+
+
+def test_mmap_load_matches_parquet(raw_csv, monkeypatch):
+    table, bridges = pipeline.split_model(pipeline.normalize(pipeline.load_raw(raw_csv), 2026))
+    store.write_model(table, bridges, 2026)
+
+    monkeypatch.setattr(config, "MMAP", False)
+    parquet = model.load_model(years=[2026])
+    monkeypatch.setattr(config, "MMAP", True)
+    mapped = model.load_model(years=[2026])
+
+    tables = [("respondents", mapped.respondents, parquet.respondents)]
+    tables += [(field, mapped.bridges[field], parquet.bridges[field]) for field in bridges]
+    for name, frame, expected in tables:
+        # copy(): memory-mapped columns compare by value
+        tm.assert_frame_equal(frame.copy(), expected, obj=name)
+        for col, values in frame.items():
+            categorical = isinstance(values.dtype, pd.CategoricalDtype)
+            array = values.array.codes if categorical else values.to_numpy()
+            assert _memmap(array) is not None, (name, col)
+            assert not array.flags.writeable, (name, col)